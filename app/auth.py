@@ -2,38 +2,82 @@ from fastapi import APIRouter,HTTPException,Depends, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import jwt, JWTError
 from models import UserLogin, UserCreate,SkillsUpdate
-from db import user_collection
-from utils.security import hash_password, verify_password, create_access_token, decode_access_token ,SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+from db import require_collections
+from utils.security import hash_password_async, verify_password_async, PasswordHasherBusy, create_access_token, decode_access_token
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+from utils.cache import TTLCache
+from matcher import matcher
+import asyncio
+import logging
+from config import settings
 router=APIRouter()
+logger = logging.getLogger(__name__)
 
 oauth_scheme= OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+# Resolved user documents keyed by JWT subject (username)
+user_cache = TTLCache(maxsize=settings.user_cache_size, ttl=settings.user_cache_ttl)
+
+def invalidate_user(username: str):
+    """Drop a cached user after their record changes."""
+    user_cache.invalidate(username)
+
+def _users():
+    return require_collections()[0]
+
+def _hasher_busy():
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server busy, please retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
 @router.post("/signup")
-def signup(user:UserCreate):
+async def signup(user:UserCreate):
     if not user.username or not user.email or not user.password:
         raise HTTPException(status_code=400, detail="All fields are required")
-    existing_user= user_collection.find_one({"username": user.username})
+    user_collection = _users()
+    existing_user= await user_collection.find_one({"username": user.username})
     if existing_user:
         raise HTTPException(status_code=400, detail="username already exists")
     user_dict=user.model_dump()
-    user_dict["password"]= hash_password(user_dict["password"])
-    user_collection.insert_one(user_dict)
+    try:
+        user_dict["password"]= await hash_password_async(user_dict["password"])
+    except PasswordHasherBusy:
+        raise _hasher_busy()
+    try:
+        await user_collection.insert_one(user_dict)
+    except DuplicateKeyError:
+        # A concurrent signup took the name after the check above
+        raise HTTPException(status_code=400, detail="username already exists")
     return {"message": "User created successfully"}
 
 @router.post("/login")
-def login(form_data: OAuth2PasswordRequestForm = Depends()):
-    existing_user = user_collection.find_one({"username": form_data.username})
+async def login(form_data: OAuth2PasswordRequestForm = Depends()):
+    user_collection = _users()
+    existing_user = await user_collection.find_one({"username": form_data.username})
     if not existing_user:
         raise HTTPException(status_code=400, detail="Invalid username or password")
-    if verify_password(form_data.password, existing_user["password"])==False:
+    try:
+        valid, new_hash = await verify_password_async(form_data.password, existing_user["password"])
+    except PasswordHasherBusy:
+        raise _hasher_busy()
+    if valid==False:
         raise HTTPException(status_code=400, detail="Invalid username or password")
+    if new_hash:
+        # Stored hash used an outdated bcrypt cost; upgrade it transparently
+        await user_collection.update_one(
+            {"_id": existing_user["_id"], "password": existing_user["password"]},
+            {"$set": {"password": new_hash}}
+        )
+        invalidate_user(form_data.username)
     
-    access_token=create_access_token(data={"sub":form_data.username},secret_key=SECRET_KEY, algorithm=ALGORITHM, expirey_minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token=create_access_token(data={"sub":form_data.username},secret_key=settings.secret_key, algorithm=settings.algorithm, expirey_minutes=settings.access_token_expire_minutes)
     return {"access_token": access_token, "token_type": "bearer"}
 
 
-def get_current_user(token:str = Depends(oauth_scheme)):
+async def get_current_user(token:str = Depends(oauth_scheme)):
     credentials_exception = HTTPException(
     status_code=status.HTTP_401_UNAUTHORIZED,
     detail="Could not validate credentials",
@@ -48,22 +92,30 @@ def get_current_user(token:str = Depends(oauth_scheme)):
     except JWTError:
         raise credentials_exception
     
-    user = user_collection.find_one({"username": username})
+    cached = user_cache.get(username)
+    if cached is not None:
+        return dict(cached)
+
+    epoch = user_cache.epoch()
+    user = await _users().find_one({"username": username})
     if user is None:
         raise credentials_exception
     user["_id"] = str(user["_id"])
-    return user
+    user_cache.set(username, user, epoch)
+    return dict(user)
 
 @router.put("/skills")
-def update_skills(update: SkillsUpdate, current_user: dict = Depends(get_current_user)):
+async def update_skills(update: SkillsUpdate, current_user: dict = Depends(get_current_user)):
     skills = update.skills
     if not isinstance(skills, list):
         raise HTTPException(status_code=400, detail="skills must be a list")
-    user_collection.update_one({"_id": ObjectId(current_user["_id"])}, {"$set": {"skills": skills}})
+    await _users().update_one({"_id": ObjectId(current_user["_id"])}, {"$set": {"skills": skills}})
+    invalidate_user(current_user["username"])
+    matcher.set_user_skills(current_user["_id"], skills)
     return {"message": "Skills updated", "skills": skills}
 
 @router.get("/me")
-def read_current_user(current_user: dict = Depends(get_current_user)):
+async def read_current_user(current_user: dict = Depends(get_current_user)):
     return {
         "username": current_user["username"],
         "email": current_user["email"],
@@ -72,41 +124,42 @@ def read_current_user(current_user: dict = Depends(get_current_user)):
     }
 
 @router.put("/telegram")
-def update_telegram_chat_id(data: dict, current_user: dict = Depends(get_current_user)):
+async def update_telegram_chat_id(data: dict, current_user: dict = Depends(get_current_user)):
     telegram_chat_id = data.get("telegram_chat_id", "").strip()
-    user_collection.update_one(
+    await _users().update_one(
         {"_id": ObjectId(current_user["_id"])}, 
         {"$set": {"telegram_chat_id": telegram_chat_id}}
     )
+    invalidate_user(current_user["username"])
     return {"message": "Telegram Chat ID updated successfully", "telegram_chat_id": telegram_chat_id}
 
 @router.get("/telegram/link")
-def generate_telegram_link(current_user: dict = Depends(get_current_user)):
+async def generate_telegram_link(current_user: dict = Depends(get_current_user)):
     """
     Generate a unique deep link for the user to connect their Telegram account.
     The link includes a temporary token that will be exchanged for the chat_id.
     """
     import secrets
-    import os
     
     # Generate a unique token
     token = secrets.token_urlsafe(32)
     
     # Store the token temporarily in the user document
-    user_collection.update_one(
+    await _users().update_one(
         {"_id": ObjectId(current_user["_id"])},
         {"$set": {"telegram_token": token}}
     )
+    invalidate_user(current_user["username"])
     
     # Get bot username from environment
-    bot_token = os.getenv("TELEGRAM_BOT_TOKEN", "")
+    bot_token = settings.telegram_bot_token
     if not bot_token:
         raise HTTPException(status_code=500, detail="Telegram bot not configured")
     
     # Extract bot username from token (format: bot_id:token)
     # For now, we'll use a placeholder or you can set BOT_USERNAME env variable
 
-    bot_username = os.getenv("TELEGRAM_BOT_USERNAME","")
+    bot_username = settings.telegram_bot_username
     
     # Create deep link
     deep_link = f"https://t.me/{bot_username}?start={token}"
@@ -118,12 +171,12 @@ def generate_telegram_link(current_user: dict = Depends(get_current_user)):
     }
 
 @router.post("/telegram/test")
-def test_telegram_notification(current_user: dict = Depends(get_current_user)):
+async def test_telegram_notification(current_user: dict = Depends(get_current_user)):
     """
     Test endpoint to verify Telegram notifications are working.
     Sends a test message to the user's connected Telegram chat.
     """
-    from utils.telegram import send_message_sync
+    from utils.telegram import send_telegram_message
     
     chat_id = current_user.get("telegram_chat_id")
     if not chat_id:
@@ -132,18 +185,25 @@ def test_telegram_notification(current_user: dict = Depends(get_current_user)):
             detail="No Telegram chat ID found. Please connect your Telegram account first."
         )
     
-    print(f"TEST: Sending test message to chat_id: {chat_id}")
+    logger.info("Sending test message to chat_id %s", chat_id)
     message = "🧪 Test Message\n\nThis is a test notification from AutoTracker. If you see this, your Telegram notifications are working! ✅"
     
     try:
-        send_message_sync(chat_id, message)
+        # Delivery can sit behind the rate limiter or retry backoff; don't hold the request
+        await asyncio.wait_for(send_telegram_message(chat_id, message), timeout=settings.telegram_test_timeout)
         return {
             "success": True,
             "message": "Test notification sent! Check your Telegram.",
             "chat_id": chat_id
         }
+    except asyncio.TimeoutError:
+        logger.warning("Test message to chat_id %s not delivered within %ss", chat_id, settings.telegram_test_timeout)
+        raise HTTPException(
+            status_code=504,
+            detail="Timed out sending test message; Telegram is rate limiting or unavailable"
+        )
     except Exception as e:
-        print(f"TEST ERROR: {str(e)}")
+        logger.error("Test message to chat_id %s failed: %s", chat_id, e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to send test message: {str(e)}"
@@ -0,0 +1,127 @@
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from pymongo import UpdateOne
+
+from config import settings
+from db import close_db, connect_db, require_collections, require_database
+
+# Full change log, one document per change:
+# {"_id", "job_id", "owner_id", "changed_at", "diff": {field: {"old", "new"}}}
+CHANGES_COLLECTION = "job_changes"
+
+
+def _collection():
+    return require_database().get_collection(CHANGES_COLLECTION)
+
+
+def change_entry(diff: Dict, changed_at: datetime) -> Dict:
+    return {"changed_at": changed_at, "diff": diff}
+
+
+def push_recent(entry: Dict) -> Dict:
+    """$push clause appending `entry` to change_history, capped to the newest few."""
+    return {"change_history": {"$each": [entry], "$slice": -settings.change_history_recent}}
+
+
+async def record_changes(changes: List[Dict]):
+    """
+    Append change documents ({"job_id", "owner_id", "changed_at", "diff"})
+    to the log. Callers write the job first, so a change is only logged
+    once it has been applied.
+    """
+    if changes:
+        await _collection().insert_many(changes, ordered=False)
+
+
+# Sort order of a job's change log, newest first
+CHANGE_SORT_FIELDS = ["changed_at", "_id"]
+
+
+def find_changes(job_id, after: Optional[Dict] = None):
+    """Cursor over a job's changes, newest first; `after` is a keyset filter."""
+    query = {"job_id": job_id, **(after or {})}
+    return _collection().find(query).sort([(f, -1) for f in CHANGE_SORT_FIELDS])
+
+
+async def history_for_jobs(job_ids: List) -> Dict:
+    """
+    Full change log of several jobs as {job_id: [{"changed_at", "diff"}, ...]},
+    oldest first like change_history. One $in query over the job_id index.
+    """
+    history = {job_id: [] for job_id in job_ids}
+    if job_ids:
+        cursor = _collection().find(
+            {"job_id": {"$in": list(job_ids)}},
+            {"job_id": 1, "changed_at": 1, "diff": 1},
+        ).sort([(f, 1) for f in CHANGE_SORT_FIELDS])
+        async for change in cursor:
+            history[change["job_id"]].append(change_entry(change["diff"], change["changed_at"]))
+    return history
+
+
+async def delete_changes(job_ids: List):
+    if job_ids:
+        await _collection().delete_many({"job_id": {"$in": list(job_ids)}})
+
+
+async def migrate_change_history(batch_size: Optional[int] = None) -> int:
+    """
+    Copy embedded change_history entries into job_changes and trim each
+    job to its newest settings.change_history_recent entries. Entries are upserted
+    by (job_id, changed_at), so re-running it or running it while
+    ingestion writes new changes does not duplicate anything.
+    Returns the number of jobs processed.
+    """
+    batch_size = batch_size or settings.migration_batch_size
+    recent = settings.change_history_recent
+    job_collection = require_collections()[1]
+    changes = _collection()
+    cursor = job_collection.find(
+        {"change_history.0": {"$exists": True}},
+        {"owner_id": 1, "change_history": 1},
+    ).batch_size(batch_size)
+
+    processed, log_ops, trim_ops = 0, [], []
+    async for job in cursor:
+        for entry in job["change_history"]:
+            if not isinstance(entry, dict) or "changed_at" not in entry:
+                continue
+            log_ops.append(UpdateOne(
+                {"job_id": job["_id"], "changed_at": entry["changed_at"]},
+                {"$setOnInsert": {"owner_id": job["owner_id"], "diff": entry.get("diff", {})}},
+                upsert=True,
+            ))
+        if len(job["change_history"]) > recent:
+            trim_ops.append(UpdateOne(
+                {"_id": job["_id"]},
+                {"$push": {"change_history": {"$each": [], "$slice": -recent}}},
+            ))
+        processed += 1
+        if processed % batch_size == 0:
+            await _flush(job_collection, changes, log_ops, trim_ops)
+            log_ops, trim_ops = [], []
+    await _flush(job_collection, changes, log_ops, trim_ops)
+    return processed
+
+
+async def _flush(job_collection, changes, log_ops, trim_ops):
+    # Log first: a job is only trimmed once its history is safe in job_changes
+    if log_ops:
+        await changes.bulk_write(log_ops, ordered=False)
+    if trim_ops:
+        await job_collection.bulk_write(trim_ops, ordered=False)
+
+
+async def _main():
+    await connect_db(wait=True)
+    try:
+        print(f"Migrated change history of {await migrate_change_history()} jobs")
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    # python changes.py -- move embedded change_history into job_changes
+    asyncio.run(_main())
@@ -0,0 +1,173 @@
+"""
+Application settings, read once from the environment (and .env).
+
+Every tunable lives on the frozen Settings dataclass; a field is set by
+the environment variable of the same name in upper case, e.g.
+MONGO_MAX_POOL_SIZE=50. Modules read `settings.<field>` where the value
+is used rather than copying it into module constants, so configure()
+overrides reach them.
+"""
+import os
+import typing
+from dataclasses import dataclass, fields, replace
+from typing import Optional
+
+from dotenv import load_dotenv
+
+
+@dataclass(frozen=True)
+class Settings:
+    # ---------- MongoDB ----------
+    mongo_uri: Optional[str] = None
+    db_name: str = "autotrackrDB"
+    mongo_max_pool_size: int = 200
+    mongo_min_pool_size: int = 0
+    mongo_max_connecting: int = 4
+    mongo_wait_queue_timeout_ms: int = 10000
+    mongo_server_selection_timeout_ms: int = 5000
+    mongo_connect_timeout_ms: int = 5000
+    # Upper bound for the delay between background reconnect attempts
+    mongo_reconnect_max_delay: float = 30.0
+
+    # ---------- auth ----------
+    secret_key: Optional[str] = None
+    algorithm: str = "HS256"
+    access_token_expire_minutes: int = 30
+    # Resolved user documents cached by JWT subject (username)
+    user_cache_size: int = 10000
+    user_cache_ttl: float = 60.0
+    # bcrypt cost factor for new hashes; older hashes are upgraded on login
+    bcrypt_rounds: int = 12
+    # "process" escapes the GIL; "thread" is for platforms without fork/spawn
+    password_hash_executor: str = "process"
+    password_hash_workers: int = min(4, os.cpu_count() or 1)
+    # Hashes queued or running before login/signup answer 503
+    password_hash_max_pending: int = 64
+
+    # ---------- Telegram ----------
+    telegram_bot_token: Optional[str] = None
+    telegram_bot_username: str = ""
+    # Point this at a local fake Bot API server in tests/benchmarks
+    telegram_api_base_url: str = "https://api.telegram.org/bot"
+    telegram_queue_size: int = 1000
+    telegram_workers: int = 4
+    telegram_max_retries: int = 5
+    # Seconds POST /auth/telegram/test waits for delivery before answering 504
+    telegram_test_timeout: float = 10.0
+    # Bot API limits: ~30 messages/s overall, 1/s per private chat, 20/min per group
+    telegram_global_rate: float = 30.0
+    telegram_chat_interval: float = 1.0
+    telegram_group_interval: float = 3.0
+    # Must match the secret_token passed to setWebhook; unset accepts any caller
+    telegram_webhook_secret: Optional[str] = None
+    webhook_queue_size: int = 1000
+    webhook_workers: int = 4
+    # Recent update_ids remembered to drop Telegram's redeliveries
+    webhook_dedup_size: int = 10000
+    # Seconds job events for one chat are collected before a message goes out
+    notify_coalesce_window: float = 30.0
+    # Jobs listed individually in a digest
+    notify_digest_top: int = 10
+
+    # ---------- jobs ----------
+    # Largest batch accepted by the /jobs/bulk endpoints
+    bulk_max_items: int = 500
+    # Documents fetched per round trip while streaming an export
+    export_batch_size: int = 500
+    ingest_batch_size: int = 1000
+    # Most recent diffs also kept inline in the job's change_history
+    change_history_recent: int = 5
+    # Days a change is kept before MongoDB's TTL monitor removes it; 0 keeps them forever
+    job_changes_ttl_days: int = 180
+    # Jobs moved per round trip by the change_history migration
+    migration_batch_size: int = 500
+
+    # ---------- scraping ----------
+    scraper_enabled: bool = False
+    # Seconds between two scrapes of the same skill query
+    scrape_interval: float = 3600.0
+    # Fraction of the interval added/removed at random so queries don't fire in lockstep
+    scrape_jitter: float = 0.1
+    # Skill queries scraped at the same time
+    scrape_concurrency: int = 8
+    # How often users' skills are reloaded into the query set
+    scrape_refresh_interval: float = 300.0
+    scraper_max_connections: int = 50
+    scraper_per_host_concurrency: int = 4
+    # Requests per second allowed against a single host
+    scraper_per_host_rate: float = 5.0
+    scraper_timeout: float = 15.0
+    scraper_user_agent: str = "AutoTracker/1.0 (+job alerts)"
+    scraper_remotive_url: str = "https://remotive.com/api/remote-jobs"
+    scraper_remoteok_url: str = "https://remoteok.com/api"
+
+    # ---------- link checker ----------
+    link_check_enabled: bool = False
+    # Seconds between two checks of the same job's link
+    link_check_interval: float = 86400.0
+    link_check_batch_size: int = 500
+    # Probes in flight overall, and per host
+    link_check_concurrency: int = 100
+    link_check_per_host_concurrency: int = 4
+    # Requests per second allowed against a single host
+    link_check_per_host_rate: float = 5.0
+    link_check_timeout: float = 10.0
+    # Inconclusive probes in a row (timeouts, 5xx, DNS errors) before a link counts as expired
+    link_check_max_failures: int = 3
+    # Seconds to wait when no job is due
+    link_check_idle_delay: float = 60.0
+
+    # ---------- logging / health ----------
+    log_level: str = "INFO"
+    # "text" for humans, "json" for one object per line
+    log_format: str = "text"
+    # Fraction of per-request debug events that are logged when DEBUG is on
+    log_debug_sample_rate: float = 1.0
+    # Seconds a /readyz result is reused before MongoDB is pinged again
+    readiness_cache_ttl: float = 2.0
+
+
+_TRUE = ("1", "true", "yes", "on")
+
+
+def _parse(raw: str, annotation):
+    if typing.get_origin(annotation) is typing.Union:
+        # Optional[X]: an empty value means unset
+        if raw == "":
+            return None
+        annotation = next(a for a in typing.get_args(annotation) if a is not type(None))
+    if annotation is bool:
+        return raw.strip().lower() in _TRUE
+    return annotation(raw)
+
+
+def load_settings(env: Optional[typing.Mapping[str, str]] = None) -> Settings:
+    """Build Settings from `env` (default: os.environ after loading .env)."""
+    if env is None:
+        load_dotenv()
+        env = os.environ
+    hints = typing.get_type_hints(Settings)
+    values = {}
+    for field in fields(Settings):
+        raw = env.get(field.name.upper())
+        if raw is not None:
+            try:
+                values[field.name] = _parse(raw, hints[field.name])
+            except ValueError:
+                raise ValueError(f"Invalid value for {field.name.upper()}: {raw!r}") from None
+    return Settings(**values)
+
+
+settings = load_settings()
+
+
+def configure(**overrides) -> Settings:
+    """
+    Change fields of the shared `settings` in place, e.g. in tests:
+    configure(scraper_enabled=True). Objects already built from settings
+    (the module-level singletons, the Mongo client) keep their values.
+    """
+    updated = replace(settings, **overrides)
+    for field in fields(Settings):
+        object.__setattr__(settings, field.name, getattr(updated, field.name))
+    return settings
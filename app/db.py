@@ -1,47 +1,118 @@
-import os
+import asyncio
 import logging
-from dotenv import load_dotenv
-from pymongo import MongoClient, errors
+from typing import Awaitable, Callable, Optional
 
-load_dotenv()
+from pymongo import AsyncMongoClient
 
-# Configuration from env
-MONGO_URI = os.getenv("MONGO_URI")
-DB_NAME = os.getenv("DB_NAME", "autotrackrDB")
+from config import settings
+from metrics import mongo_listener
 
-# Exports
+# Exports, set by connect_db() in the app's lifespan
 mongo_client = None
 db = None
 user_collection = None
 job_collection = None
 
-if MONGO_URI:
+_connected = False
+_connect_task: Optional[asyncio.Task] = None
+
+
+def _create_client() -> AsyncMongoClient:
+	# Creating the client does no I/O; connections are opened on first use
+	return AsyncMongoClient(
+		settings.mongo_uri,
+		serverSelectionTimeoutMS=settings.mongo_server_selection_timeout_ms,
+		connectTimeoutMS=settings.mongo_connect_timeout_ms,
+		maxPoolSize=settings.mongo_max_pool_size,
+		minPoolSize=settings.mongo_min_pool_size,
+		maxConnecting=settings.mongo_max_connecting,
+		waitQueueTimeoutMS=settings.mongo_wait_queue_timeout_ms,
+		event_listeners=[mongo_listener],
+	)
+
+
+async def ping_db() -> bool:
+	"""Round-trip to the server; False when it is unreachable or not configured."""
+	if mongo_client is None:
+		return False
 	try:
-		# Fail fast when the URI is invalid or DNS can't be resolved
-		mongo_client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=5000)
-		# quick health check
-		mongo_client.admin.command("ping")
-		db = mongo_client.get_database(DB_NAME)
+		await mongo_client.admin.command("ping")
+		return True
+	except Exception:
+		return False
+
+
+async def connect_db(on_connect: Optional[Callable[[], Awaitable[None]]] = None, wait: bool = False):
+	"""
+	Create the shared client and connect in the background: a task pings
+	the server with backoff until it answers, then runs `on_connect`, so
+	startup never blocks on MongoDB. With `wait` (scripts) the first ping
+	is awaited instead.
+	"""
+	global mongo_client, db, user_collection, job_collection, _connect_task
+	if not settings.mongo_uri:
+		logging.warning("MONGO_URI not set; MongoDB features disabled.")
+		return
+	if mongo_client is None:
+		mongo_client = _create_client()
+		db = mongo_client.get_database(settings.db_name)
 		user_collection = db.get_collection("users")
 		job_collection = db.get_collection("jobs")
-		logging.info("Connected to MongoDB database '%s'", DB_NAME)
-	except Exception as exc:  # pragma: no cover - environment dependent
-		logging.exception("Could not connect to MongoDB: %s", exc)
-		mongo_client = None
-		db = None
-		user_collection = None
-		job_collection = None
-else:
-	logging.warning("MONGO_URI not set; MongoDB features disabled.")
+	if wait and await ping_db():
+		await _mark_connected(on_connect)
+	elif not _connected and _connect_task is None:
+		_connect_task = asyncio.create_task(_connect_loop(on_connect))
+
+
+async def _mark_connected(on_connect):
+	global _connected
+	_connected = True
+	logging.info("Connected to MongoDB database '%s'", settings.db_name)
+	if on_connect is not None:
+		try:
+			await on_connect()
+		except Exception:
+			logging.exception("MongoDB on-connect hook failed")
+
+
+async def _connect_loop(on_connect):
+	global _connect_task
+	delay = 1.0
+	while not await ping_db():
+		if delay == 1.0:
+			logging.warning("MongoDB unreachable; retrying in the background")
+		await asyncio.sleep(delay)
+		delay = min(delay * 2, settings.mongo_reconnect_max_delay)
+	_connect_task = None
+	await _mark_connected(on_connect)
 
 
 def is_db_connected() -> bool:
-	"""Return True when a MongoDB connection is available."""
-	return mongo_client is not None
+	"""Return True once the server has answered a ping."""
+	return _connected
 
 
 def require_collections():
 	"""Return (user_collection, job_collection) or raise RuntimeError if DB not connected."""
 	if not is_db_connected():
 		raise RuntimeError("MongoDB is not connected. Set MONGO_URI or check your connection.")
-	return user_collection, job_collection
\ No newline at end of file
+	return user_collection, job_collection
+
+
+def require_database():
+	"""Return the database handle or raise RuntimeError if DB not connected."""
+	if not is_db_connected():
+		raise RuntimeError("MongoDB is not connected. Set MONGO_URI or check your connection.")
+	return db
+
+
+async def close_db():
+	"""Stop connecting and close the async client's connection pool."""
+	global mongo_client, db, user_collection, job_collection, _connected, _connect_task
+	if _connect_task is not None:
+		_connect_task.cancel()
+		_connect_task = None
+	if mongo_client is not None:
+		await mongo_client.close()
+	mongo_client = db = user_collection = job_collection = None
+	_connected = False
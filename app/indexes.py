@@ -0,0 +1,205 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import OperationFailure
+
+import db
+from changes import CHANGES_COLLECTION
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Indexes the routers rely on, per collection. Names are fixed so the
+# registry can tell which ones are missing on an existing deployment.
+INDEXES = {
+    "users": [
+        IndexModel([("username", ASCENDING)], name="username_unique", unique=True),
+        IndexModel([("telegram_token", ASCENDING)], name="telegram_token_sparse", sparse=True),
+    ],
+    "jobs": [
+        IndexModel(
+            [("owner_id", ASCENDING), ("date_added", DESCENDING), ("_id", DESCENDING)],
+            name="owner_date_added",
+        ),
+        # Manually added jobs have no external_id, so only scraped ones are unique
+        IndexModel(
+            [("owner_id", ASCENDING), ("external_id", ASCENDING)],
+            name="owner_external_id_unique",
+            unique=True,
+            partialFilterExpression={"external_id": {"$type": "string"}},
+        ),
+        # Owner prefix keeps /jobs/search inside one user's postings
+        IndexModel(
+            [("owner_id", ASCENDING), ("title", TEXT), ("company", TEXT),
+             ("description", TEXT), ("skills_matched", TEXT)],
+            name="owner_text",
+            weights={"title": 10, "skills_matched": 5, "company": 3, "description": 1},
+        ),
+        # Link checker's due queue; never-checked (null) jobs sort first
+        IndexModel([("last_checked", ASCENDING)], name="last_checked"),
+    ],
+    CHANGES_COLLECTION: [
+        IndexModel(
+            [("job_id", ASCENDING), ("changed_at", DESCENDING), ("_id", DESCENDING)],
+            name="job_changed_at",
+        ),
+    ],
+}
+
+
+def registered_indexes() -> dict:
+    """INDEXES plus the job_changes TTL index when retention is configured."""
+    indexes = {name: list(models) for name, models in INDEXES.items()}
+    if settings.job_changes_ttl_days > 0:
+        indexes[CHANGES_COLLECTION].append(IndexModel(
+            [("changed_at", ASCENDING)],
+            name="changed_at_ttl",
+            expireAfterSeconds=settings.job_changes_ttl_days * 86400,
+        ))
+    return indexes
+
+
+# Server error code when an index exists with other options
+INDEX_OPTIONS_CONFLICT = 85
+
+# Representative shapes of the routers' hot queries, used to check that
+# each one is served by an index: (label, collection, filter, sort).
+_SAMPLE_ID = ObjectId()
+_SAMPLE_DATE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+HOT_QUERIES = [
+    ("auth.get_current_user", "users", {"username": "sample"}, None),
+    ("telegram.webhook", "users", {"telegram_token": "sample"}, None),
+    ("jobs.get_jobs", "jobs", {"owner_id": _SAMPLE_ID}, [("date_added", -1), ("_id", -1)]),
+    ("jobs.get_job", "jobs", {"_id": _SAMPLE_ID, "owner_id": _SAMPLE_ID}, None),
+    ("jobs.search_jobs", "jobs", {"owner_id": _SAMPLE_ID, "$text": {"$search": "sample"}}, None),
+    ("jobs.job_history", CHANGES_COLLECTION, {"job_id": _SAMPLE_ID}, [("changed_at", -1), ("_id", -1)]),
+    ("jobs.export_jobs", CHANGES_COLLECTION, {"job_id": {"$in": [_SAMPLE_ID]}}, [("changed_at", 1), ("_id", 1)]),
+    ("ingest.ingest_jobs", "jobs", {"owner_id": _SAMPLE_ID, "external_id": {"$in": ["sample"]}}, None),
+    ("linkcheck.due_jobs", "jobs", {"last_checked": {"$not": {"$gt": _SAMPLE_DATE}}}, [("last_checked", 1)]),
+]
+
+
+def _database(database=None):
+    return database if database is not None else db.require_database()
+
+
+async def ensure_indexes(database=None):
+    """Create every registered index. Safe to run on each startup."""
+    database = _database(database)
+    for collection_name, models in registered_indexes().items():
+        collection = database.get_collection(collection_name)
+        for model in models:
+            try:
+                await collection.create_indexes([model])
+            except OperationFailure as e:
+                ttl = model.document.get("expireAfterSeconds")
+                if e.code == INDEX_OPTIONS_CONFLICT and ttl is not None:
+                    # Retention was reconfigured; TTLs can be changed in place
+                    await database.command(
+                        "collMod", collection_name,
+                        index={"name": model.document["name"], "expireAfterSeconds": ttl},
+                    )
+                    continue
+                # e.g. duplicate usernames blocking the unique index
+                logger.error(
+                    "Could not create index %s on %s: %s",
+                    model.document["name"], collection_name, e,
+                )
+
+
+async def index_report(database=None) -> dict:
+    """
+    Compare the registry with what exists on the server.
+
+    Returns {"missing": [...], "unused": [...]} where entries are
+    "collection.index_name"; "unused" lists registered indexes with no
+    recorded accesses since the server started.
+    """
+    database = _database(database)
+    missing, unused = [], []
+    for collection_name, models in registered_indexes().items():
+        collection = database.get_collection(collection_name)
+        existing = set()
+        async for index in await collection.list_indexes():
+            existing.add(index["name"])
+        usage = {}
+        try:
+            cursor = await collection.aggregate([{"$indexStats": {}}])
+            async for stat in cursor:
+                usage[stat["name"]] = stat["accesses"]["ops"]
+        except OperationFailure:
+            pass  # $indexStats needs extra privileges on some deployments
+        for model in models:
+            name = model.document["name"]
+            if name not in existing:
+                missing.append(f"{collection_name}.{name}")
+            elif usage.get(name) == 0:
+                unused.append(f"{collection_name}.{name}")
+    return {"missing": missing, "unused": unused}
+
+
+def _plan_stages(plan) -> list:
+    """Flatten an explain() plan tree into (stage, indexName) pairs."""
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append((plan["stage"], plan.get("indexName")))
+        for value in plan.values():
+            stages.extend(_plan_stages(value))
+    elif isinstance(plan, list):
+        for value in plan:
+            stages.extend(_plan_stages(value))
+    return stages
+
+
+async def explain_hot_queries(database=None) -> dict:
+    """
+    Run explain() on each hot query and return {label: index_name or None}.
+    None means the winning plan fell back to a collection scan.
+    """
+    database = _database(database)
+    results = {}
+    for label, collection_name, query, sort in HOT_QUERIES:
+        cursor = database.get_collection(collection_name).find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        explanation = await cursor.explain()
+        stages = _plan_stages(explanation["queryPlanner"]["winningPlan"])
+        if any(stage == "COLLSCAN" for stage, _ in stages):
+            results[label] = None
+        else:
+            names = [name for stage, name in stages if name]
+            results[label] = names[0] if names else "_id_"
+    return results
+
+
+async def bootstrap_indexes(database=None):
+    """Startup hook: create indexes and log anything still missing."""
+    await ensure_indexes(database)
+    report = await index_report(database)
+    if report["missing"]:
+        logger.warning("Missing MongoDB indexes: %s", ", ".join(report["missing"]))
+    if report["unused"]:
+        logger.info("MongoDB indexes with no recorded use: %s", ", ".join(report["unused"]))
+
+
+async def _main():
+    await db.connect_db(wait=True)
+    try:
+        await ensure_indexes()
+        print(await index_report())
+        plans = await explain_hot_queries()
+    finally:
+        await db.close_db()
+    for label, index_name in plans.items():
+        print(f"{label}: {index_name or 'COLLSCAN'}")
+    if not all(plans.values()):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    # python indexes.py -- create indexes and fail if a hot query is unindexed
+    asyncio.run(_main())
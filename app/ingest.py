@@ -0,0 +1,196 @@
+import asyncio
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
+
+from config import settings
+from changes import change_entry, push_recent, record_changes
+from db import require_collections
+from stats import apply_stats_delta
+from versions import bump_version
+
+logger = logging.getLogger(__name__)
+
+# Fields that make up a posting's content; a change to any of them is
+# recorded in change_history, anything else is bookkeeping.
+CONTENT_FIELDS = ("title", "company", "location", "description", "link", "source", "skills_matched")
+
+
+def content_hash(job: Dict) -> str:
+    """Stable hash of a job's content fields."""
+    content = {f: job.get(f) for f in CONTENT_FIELDS}
+    if content["skills_matched"] is not None:
+        content["skills_matched"] = sorted(content["skills_matched"])
+    raw = json.dumps(content, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def diff_fields(old: Dict, new: Dict) -> Dict:
+    """Field-level diff of content fields: {field: {"old": ..., "new": ...}}."""
+    return {
+        f: {"old": old.get(f), "new": new.get(f)}
+        for f in CONTENT_FIELDS
+        if old.get(f) != new.get(f)
+    }
+
+
+@dataclass
+class IngestResult:
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    errors: List[str] = field(default_factory=list)
+    # (kind, job) pairs for notifications; kind is "new" or "updated"
+    events: List[tuple] = field(default_factory=list)
+
+    def merge(self, other: "IngestResult"):
+        self.inserted += other.inserted
+        self.updated += other.updated
+        self.unchanged += other.unchanged
+        self.errors.extend(other.errors)
+        self.events.extend(other.events)
+
+
+def _content(job: Dict) -> Dict:
+    doc = {f: job.get(f) for f in CONTENT_FIELDS}
+    doc["description"] = doc["description"] or ""
+    doc["skills_matched"] = list(doc["skills_matched"] or [])
+    return doc
+
+
+async def _ingest_batch(owner_id: ObjectId, batch: Dict[str, Dict]) -> IngestResult:
+    job_collection = require_collections()[1]
+    result = IngestResult()
+    now = datetime.now(timezone.utc)
+
+    projection = {f: 1 for f in CONTENT_FIELDS}
+    projection.update({"external_id": 1, "content_hash": 1, "applied": 1, "date_added": 1})
+    existing = {
+        doc["external_id"]: doc
+        async for doc in job_collection.find(
+            {"owner_id": owner_id, "external_id": {"$in": list(batch)}}, projection
+        )
+    }
+
+    # Inserts go through one bulk_write; each carries (event, new job) for
+    # notifications and the stats counters
+    inserts, insert_events = [], []
+    # Changed postings: (filter, update, event, (new job, previous job, change entry))
+    updates = []
+    for external_id, job in batch.items():
+        content = _content(job)
+        digest = content_hash(content)
+        current = existing.get(external_id)
+        if current is None:
+            inserts.append(UpdateOne(
+                {"owner_id": owner_id, "external_id": external_id},
+                {"$setOnInsert": {
+                    **content,
+                    "owner_id": owner_id,
+                    "external_id": external_id,
+                    "applied": False,
+                    "date_added": now,
+                    "last_checked": now,
+                    "content_hash": digest,
+                    "change_history": [],
+                }},
+                upsert=True,
+            ))
+            insert_events.append((
+                ("new", {**content, "external_id": external_id}),
+                {**content, "applied": False, "date_added": now},
+            ))
+        elif current.get("content_hash") != digest:
+            entry = change_entry(diff_fields(current, content), now)
+            updates.append((
+                # Guard on the old hash so a concurrent ingest can't apply a stale diff
+                {"_id": current["_id"], "content_hash": current.get("content_hash")},
+                {
+                    "$set": {**content, "content_hash": digest, "last_checked": now},
+                    "$push": push_recent(entry),
+                },
+                ("updated", {**content, "_id": current["_id"], "external_id": external_id}),
+                ({**current, **content}, current, entry),
+            ))
+        else:
+            result.unchanged += 1
+
+    added, removed, changes = [], [], []
+    if inserts:
+        try:
+            details = (await job_collection.bulk_write(inserts, ordered=False)).bulk_api_result
+        except BulkWriteError as e:
+            details = e.details
+            result.errors.extend(err.get("errmsg", "") for err in details.get("writeErrors", []))
+        result.inserted += details.get("nUpserted", 0)
+        # An upsert that lost a race with a concurrent insert matched instead
+        # (or failed), so only ops reported as upserted count as new jobs
+        upserted = {u["index"] for u in details.get("upserted", [])}
+        for i, (event, job) in enumerate(insert_events):
+            if i in upserted:
+                result.events.append(event)
+                added.append(job)
+
+    if updates:
+        # Sent individually so a lost hash guard (0 matched) is visible
+        outcomes = await asyncio.gather(
+            *(job_collection.update_one(query, update) for query, update, _, _ in updates),
+            return_exceptions=True,
+        )
+        for (_, _, event, (job, previous, entry)), outcome in zip(updates, outcomes):
+            if isinstance(outcome, PyMongoError):
+                result.errors.append(str(outcome))
+                continue
+            if isinstance(outcome, BaseException):
+                raise outcome
+            if not outcome.matched_count:
+                continue
+            result.updated += 1
+            result.events.append(event)
+            added.append(job)
+            removed.append(previous)
+            changes.append({"job_id": previous["_id"], "owner_id": owner_id, **entry})
+
+    await apply_stats_delta(owner_id, added=added, removed=removed)
+    await record_changes(changes)
+    return result
+
+
+async def ingest_jobs(owner_id, jobs: Iterable[Dict], batch_size: Optional[int] = None) -> IngestResult:
+    """
+    Upsert scraped jobs for one user, keyed by (owner_id, external_id).
+
+    Each batch costs one find() for the stored hashes, one unordered
+    bulk_write for new postings and one concurrent, hash-guarded update per
+    changed posting. Changed postings get their fields and last_checked
+    updated and a diff logged to job_changes (the newest few also stay in
+    change_history) unless a concurrent ingest got there first; unchanged
+    postings are not written at all.
+    """
+    owner_id = ObjectId(owner_id) if isinstance(owner_id, str) else owner_id
+    batch_size = batch_size or settings.ingest_batch_size
+    total = IngestResult()
+    batch: Dict[str, Dict] = {}
+    for job in jobs:
+        if not job.get("external_id"):
+            total.errors.append(f"missing external_id: {job.get('title')!r}")
+            continue
+        # Last occurrence wins when a batch repeats a posting
+        batch[job["external_id"]] = job
+        if len(batch) >= batch_size:
+            total.merge(await _ingest_batch(owner_id, batch))
+            batch = {}
+    if batch:
+        total.merge(await _ingest_batch(owner_id, batch))
+    if total.inserted or total.updated:
+        await bump_version(owner_id)
+    if total.errors:
+        logger.warning("Ingest for %s finished with %d errors", owner_id, len(total.errors))
+    return total
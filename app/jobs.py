@@ -1,16 +1,44 @@
+import csv
+import io
+import json
+import logging
 from datetime import datetime, timezone
 from bson import ObjectId
 from models import Job
-from fastapi import APIRouter, Depends, HTTPException
-from models import Job, JobCreate, PyObjectId
-from db import job_collection
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from models import Job, JobCreate, JobSummary, JobListAdapter, JobSummaryListAdapter, JobSearchResult, JobStats, JobChange, JobChangeListAdapter, PyObjectId, BulkJobCreate, BulkJobUpdate, BulkJobDelete, BulkItemResult, BulkResult
+from config import settings
+from db import require_collections
 from auth import get_current_user
-from typing import List
-from utils.telegram import send_message_sync
+from typing import List, Literal, Optional, Union
+from notifications import notify_job_event, notify_job_events
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
+from changes import CHANGE_SORT_FIELDS, delete_changes, find_changes, history_for_jobs
+from stats import apply_stats_delta, get_stats
+from versions import bump_version, etag_matches, get_version, make_etag
+from utils.log import debug_event
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, keyset_after, next_cursor
 router=APIRouter()
+logger = logging.getLogger(__name__)
+
+def _jobs():
+    return require_collections()[1]
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+
+def _set_etag(response: Response, etag: str):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+
+def _json_response(body: bytes, response: Response) -> Response:
+    """Send pre-serialized JSON, keeping headers set on the injected response."""
+    return Response(content=body, media_type="application/json", headers=dict(response.headers))
 
 @router.post("/", response_model=Job)
-def create_job(job: JobCreate, current_user: dict = Depends(get_current_user)):
+async def create_job(job: JobCreate, current_user: dict = Depends(get_current_user)):
     try:
         job_dict = job.model_dump()
         job_dict["owner_id"] = str(current_user["_id"])
@@ -21,113 +49,515 @@ def create_job(job: JobCreate, current_user: dict = Depends(get_current_user)):
             **job_dict,
             "owner_id": ObjectId(job_dict["owner_id"])
         }
-        result = job_collection.insert_one(mongo_doc)
+        result = await _jobs().insert_one(mongo_doc)
         job_dict["_id"] = str(result.inserted_id)
+        await bump_version(mongo_doc["owner_id"])
+        await apply_stats_delta(mongo_doc["owner_id"], added=[mongo_doc])
 
-        # Send Telegram notification
-        try:
-            chat_id = current_user.get("telegram_chat_id")
-            print(f"DEBUG: User telegram_chat_id: {chat_id}")
-            if chat_id:
-                message = (
-                    f"🆕 New Job Added!\n\n"
-                    f"📋 Title: {job_dict['title']}\n"
-                    f"🏢 Company: {job_dict['company']}\n"
-                    f"📍 Location: {job_dict.get('location', 'Remote/Not Specified')}\n"
-                    f"🔗 Link: {job_dict.get('link', 'N/A')}"
-                )
-                print(f"DEBUG: Attempting to send Telegram notification...")
-                send_message_sync(chat_id, message)
-            else:
-                print("DEBUG: No telegram_chat_id found for user, skipping notification")
-        except Exception as e:
-            print(f"ERROR: Failed to send Telegram notification: {str(e)}")
-            # Don't fail job creation if notification fails
+        # Send Telegram notification (coalesced per chat)
+        chat_id = current_user.get("telegram_chat_id")
+        if chat_id:
+            notify_job_event(chat_id, "new", job_dict)
+        debug_event(logger, "job created", job_id=job_dict["_id"], notified=bool(chat_id))
         
         return Job(**job_dict)
     except Exception as e:
-        print(f"Error in create_job: {str(e)}")
+        logger.exception("Error in create_job: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to create job: {str(e)}")
 
-@router.get("/", response_model=List[Job])
-def get_jobs(current_user: dict = Depends(get_current_user)):
+def _object_id(value: str) -> Optional[ObjectId]:
+    return ObjectId(value) if ObjectId.is_valid(value) else None
+
+def _bulk_result(results: List[BulkItemResult]) -> BulkResult:
+    ok = {"created", "updated", "deleted"}
+    succeeded = sum(1 for r in results if r.status in ok)
+    return BulkResult(results=results, succeeded=succeeded, failed=len(results) - succeeded)
+
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_create_jobs(payload: BulkJobCreate, current_user: dict = Depends(get_current_user)):
+    """Create up to settings.bulk_max_items jobs with one insert_many."""
+    owner_id = ObjectId(current_user["_id"])
+    now = datetime.now(timezone.utc)
+    docs = [{**job.model_dump(), "owner_id": owner_id, "date_added": now} for job in payload.jobs]
+    failed = {}
+    try:
+        await _jobs().insert_many(docs, ordered=False)
+    except BulkWriteError as e:
+        failed = {err["index"]: err.get("errmsg", "write error") for err in e.details.get("writeErrors", [])}
+
+    results, events = [], []
+    for index, doc in enumerate(docs):
+        # insert_many assigns _id client-side, so every doc has one
+        if index in failed:
+            results.append(BulkItemResult(index=index, status="error", error=failed[index]))
+            continue
+        results.append(BulkItemResult(index=index, id=str(doc["_id"]), status="created"))
+        events.append(("new", doc))
+    if events:
+        await bump_version(owner_id)
+        await apply_stats_delta(owner_id, added=[doc for _, doc in events])
+    notify_job_events(current_user.get("telegram_chat_id"), events)
+    return _bulk_result(results)
+
+@router.patch("/bulk", response_model=BulkResult)
+async def bulk_update_jobs(payload: BulkJobUpdate, current_user: dict = Depends(get_current_user)):
+    """Apply partial updates (e.g. applied=true) to many jobs with one bulk_write."""
+    owner_id = ObjectId(current_user["_id"])
+    job_collection = _jobs()
+    results: List[Optional[BulkItemResult]] = [None] * len(payload.updates)
+    ids = {}
+    for index, item in enumerate(payload.updates):
+        oid = _object_id(item.id)
+        # Explicit nulls are dropped: Job requires these fields to hold values
+        changes = item.model_dump(exclude={"id"}, exclude_unset=True, exclude_none=True)
+        if oid is None:
+            results[index] = BulkItemResult(index=index, id=item.id, status="invalid", error="invalid job id")
+        elif not changes:
+            results[index] = BulkItemResult(index=index, id=item.id, status="invalid", error="no fields to update")
+        else:
+            ids[index] = (oid, changes)
+
+    owned = {}
+    if ids:
+        async for doc in job_collection.find(
+            {"_id": {"$in": [oid for oid, _ in ids.values()]}, "owner_id": owner_id},
+            {"title": 1, "company": 1, "location": 1, "link": 1, "applied": 1, "source": 1, "date_added": 1},
+        ):
+            owned[doc["_id"]] = doc
+
+    # A repeated id becomes one write with its items' changes merged in order
+    merged, indexes = {}, {}
+    for index, (oid, changes) in ids.items():
+        if oid not in owned:
+            results[index] = BulkItemResult(index=index, id=str(oid), status="not_found")
+            continue
+        merged.setdefault(oid, {}).update(changes)
+        indexes.setdefault(oid, []).append(index)
+
+    op_oids = list(merged)
+    ops = [UpdateOne({"_id": oid, "owner_id": owner_id}, {"$set": merged[oid]}) for oid in op_oids]
+
+    failed = {}
+    if ops:
+        try:
+            await job_collection.bulk_write(ops, ordered=False)
+        except BulkWriteError as e:
+            failed = {err["index"]: err.get("errmsg", "write error") for err in e.details.get("writeErrors", [])}
+
+    events = []
+    for i, oid in enumerate(op_oids):
+        for index in indexes[oid]:
+            if i in failed:
+                results[index] = BulkItemResult(index=index, id=str(oid), status="error", error=failed[i])
+            else:
+                results[index] = BulkItemResult(index=index, id=str(oid), status="updated")
+        if i not in failed:
+            events.append(("updated", {**owned[oid], **merged[oid]}))
+    if events:
+        await bump_version(owner_id)
+        await apply_stats_delta(
+            owner_id,
+            added=[job for _, job in events],
+            removed=[owned[job["_id"]] for _, job in events],
+        )
+    notify_job_events(current_user.get("telegram_chat_id"), events)
+    return _bulk_result(results)
+
+@router.delete("/bulk", response_model=BulkResult)
+async def bulk_delete_jobs(payload: BulkJobDelete, current_user: dict = Depends(get_current_user)):
+    """Delete many of the user's jobs with one delete_many."""
+    owner_id = ObjectId(current_user["_id"])
+    job_collection = _jobs()
+    oids = [_object_id(job_id) for job_id in payload.ids]
+    valid = [oid for oid in oids if oid is not None]
+
+    owned = {}
+    if valid:
+        async for doc in job_collection.find(
+            {"_id": {"$in": valid}, "owner_id": owner_id},
+            {"company": 1, "applied": 1, "source": 1, "date_added": 1},
+        ):
+            owned[doc["_id"]] = doc
+        if owned:
+            await job_collection.delete_many({"_id": {"$in": list(owned)}, "owner_id": owner_id})
+            await delete_changes(owned)
+            await bump_version(owner_id)
+            await apply_stats_delta(owner_id, removed=owned.values())
+
+    results = []
+    for index, (job_id, oid) in enumerate(zip(payload.ids, oids)):
+        if oid is None:
+            results.append(BulkItemResult(index=index, id=job_id, status="invalid", error="invalid job id"))
+        elif oid in owned:
+            results.append(BulkItemResult(index=index, id=job_id, status="deleted"))
+            # A repeated id only counts as deleted once
+            del owned[oid]
+        else:
+            results.append(BulkItemResult(index=index, id=job_id, status="not_found"))
+    return _bulk_result(results)
+
+# Fields left out of the "summary" list view
+SUMMARY_EXCLUDED_FIELDS = {"description": 0, "change_history": 0}
+JOB_SORT_FIELDS = ["date_added", "_id"]
+# CSV export columns; change_history is appended as a JSON column on request
+EXPORT_COLUMNS = [
+    "_id", "title", "company", "location", "link", "applied", "date_added",
+    "source", "external_id", "skills_matched", "last_checked", "expired", "description",
+]
+
+def _job_filter(user_id: ObjectId, applied: Optional[bool], source: Optional[str], company: Optional[str]) -> dict:
+    query = {"owner_id": user_id}
+    if applied is not None:
+        query["applied"] = applied
+    if source is not None:
+        query["source"] = source
+    if company is not None:
+        query["company"] = company
+    return query
+
+async def _export_rows(cursor, format: str, include_history: bool):
+    """Yield the export body a cursor batch at a time, holding one batch in memory."""
+    exclude = None if include_history else {"change_history"}
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if format == "csv":
+        writer.writerow(EXPORT_COLUMNS + (["change_history"] if include_history else []))
+
+    async def render(docs):
+        if include_history:
+            # The job only keeps its newest changes inline; the full log is in job_changes
+            history = await history_for_jobs([doc["_id"] for doc in docs])
+        for doc in docs:
+            if include_history:
+                doc["change_history"] = history[doc["_id"]]
+            job = Job.model_validate(doc)
+            if format == "ndjson":
+                buffer.write(job.model_dump_json(by_alias=True, exclude=exclude))
+                buffer.write("\n")
+            else:
+                data = job.model_dump(mode="json", by_alias=True)
+                row = [data[c] for c in EXPORT_COLUMNS]
+                row[EXPORT_COLUMNS.index("skills_matched")] = ";".join(data["skills_matched"])
+                if include_history:
+                    row.append(json.dumps(data["change_history"], ensure_ascii=False))
+                writer.writerow(row)
+        body = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return body
+
+    docs = []
+    try:
+        async for doc in cursor:
+            docs.append(doc)
+            if len(docs) == settings.export_batch_size:
+                yield await render(docs)
+                docs = []
+        if docs:
+            yield await render(docs)
+        elif format == "csv" and buffer.tell():
+            # Header only
+            yield buffer.getvalue()
+    finally:
+        # Also runs when the client disconnects mid-download
+        await cursor.close()
+
+@router.get("/export")
+async def export_jobs(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    include_history: bool = False,
+    applied: Optional[bool] = None,
+    source: Optional[str] = None,
+    company: Optional[str] = None,
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Download all of the user's jobs, newest first, as NDJSON or CSV.
+    Rows are streamed from a batched cursor, so memory use does not grow
+    with the number of jobs. The full change history, read from job_changes
+    a batch of jobs at a time, is only included on request.
+    """
     user_id = ObjectId(current_user["_id"]) if isinstance(current_user["_id"], str) else current_user["_id"]
-    
-    cursor = job_collection.find({"owner_id": user_id})
-    jobs = []
-    for job in cursor:
-        job_dict = {
-            **job,
-            "_id": str(job["_id"]),
-            "owner_id": str(job["owner_id"])
+    query = _job_filter(user_id, applied, source, company)
+    cursor = _jobs().find(query, {"change_history": 0}).sort(
+        [("date_added", -1), ("_id", -1)]
+    ).batch_size(settings.export_batch_size)
+
+    media_type = "application/x-ndjson" if format == "ndjson" else "text/csv"
+    filename = f"jobs-{datetime.now(timezone.utc):%Y%m%d}.{format}"
+    return StreamingResponse(
+        _export_rows(cursor, format, include_history),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+@router.get("/", response_model=Union[List[Job], List[JobSummary]])
+async def get_jobs(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    view: Literal["full", "summary"] = "full",
+    applied: Optional[bool] = None,
+    source: Optional[str] = None,
+    company: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    List the user's jobs newest first, `limit` at a time. When more rows
+    exist the opaque cursor for the next page is returned in X-Next-Cursor.
+    Responses carry an ETag derived from the user's jobs version, so a
+    matching If-None-Match is answered with 304 without querying jobs.
+    """
+    user_id = ObjectId(current_user["_id"]) if isinstance(current_user["_id"], str) else current_user["_id"]
+
+    version = await get_version(user_id)
+    etag = make_etag(user_id, version, "list", limit, cursor, view, applied, source, company)
+    if etag_matches(if_none_match, etag):
+        return _not_modified(etag)
+    _set_etag(response, etag)
+
+    query = _job_filter(user_id, applied, source, company)
+    if cursor:
+        query.update(keyset_after(JOB_SORT_FIELDS, decode_cursor(cursor, len(JOB_SORT_FIELDS))))
+
+    projection = SUMMARY_EXCLUDED_FIELDS if view == "summary" else None
+    adapter = JobSummaryListAdapter if view == "summary" else JobListAdapter
+    rows = await _jobs().find(query, projection).sort(
+        [("date_added", -1), ("_id", -1)]
+    ).limit(limit + 1).to_list()
+
+    token = next_cursor(rows, limit, JOB_SORT_FIELDS)
+    if token:
+        response.headers["X-Next-Cursor"] = token
+
+    # Validate the raw documents once and serialize in pydantic-core,
+    # bypassing FastAPI's second validation pass over response_model
+    jobs = adapter.validate_python(rows[:limit])
+    return _json_response(adapter.dump_json(jobs, by_alias=True), response)
+
+# Most frequent values listed per search facet
+SEARCH_FACET_LIMIT = 20
+SEARCH_SORT_FIELDS = {"relevance": ["score", "_id"], "date": ["date_added", "_id"]}
+
+def _facet_stage(filters: dict, page: list, with_facets: bool) -> dict:
+    """
+    One $facet stage for the results page plus, on the first page, the
+    total and per-facet counts. Each facet is counted with every filter
+    except its own, so the counts show what selecting another value yields.
+    """
+    def others(name):
+        return {k: v for k, v in filters.items() if k != name}
+
+    branches = {"results": [{"$match": filters}, *page]}
+    if with_facets:
+        branches["total"] = [{"$match": filters}, {"$count": "n"}]
+        for name in ("applied", "source", "location"):
+            branches[name] = [
+                {"$match": others(name)},
+                {"$group": {"_id": f"${name}", "count": {"$sum": 1}}},
+                {"$sort": {"count": -1, "_id": 1}},
+                {"$limit": SEARCH_FACET_LIMIT},
+            ]
+    return {"$facet": branches}
+
+@router.get("/search", response_model=JobSearchResult)
+async def search_jobs(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    sort: Literal["relevance", "date"] = "relevance",
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    applied: Optional[bool] = None,
+    source: Optional[str] = None,
+    location: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    if_none_match: Optional[str] = Header(None),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Full-text search over title, company, description and skills_matched,
+    ranked by relevance (or newest first) and narrowed by facet filters.
+    Matches, page and facet counts come from one aggregation over the
+    owner_text index; the next page's cursor is returned in next_cursor.
+    """
+    user_id = ObjectId(current_user["_id"]) if isinstance(current_user["_id"], str) else current_user["_id"]
+
+    version = await get_version(user_id)
+    etag = make_etag(user_id, version, "search", q, sort, limit, cursor, applied, source, location, date_from, date_to)
+    if etag_matches(if_none_match, etag):
+        return _not_modified(etag)
+    _set_etag(response, etag)
+
+    filters = {}
+    if applied is not None:
+        filters["applied"] = applied
+    if source is not None:
+        filters["source"] = source
+    if location is not None:
+        filters["location"] = location
+    if date_from is not None or date_to is not None:
+        filters["date_added"] = {
+            op: value for op, value in (("$gte", date_from), ("$lte", date_to)) if value is not None
         }
-        jobs.append(Job(**job_dict))
-    return jobs
+
+    fields = SEARCH_SORT_FIELDS[sort]
+    page = []
+    if cursor:
+        page.append({"$match": keyset_after(fields, decode_cursor(cursor, len(fields)))})
+    page += [{"$sort": {f: -1 for f in fields}}, {"$limit": limit + 1}]
+
+    pipeline = [
+        # $text must lead the pipeline; the owner_id equality selects the index prefix
+        {"$match": {"owner_id": user_id, "$text": {"$search": q}}},
+        {"$addFields": {"score": {"$meta": "textScore"}}},
+        {"$project": SUMMARY_EXCLUDED_FIELDS},
+        _facet_stage(filters, page, with_facets=not cursor),
+    ]
+    facet = (await (await _jobs().aggregate(pipeline)).to_list())[0]
+
+    rows = facet["results"]
+    result = {"results": rows[:limit], "next_cursor": next_cursor(rows, limit, fields)}
+    if not cursor:
+        result["total"] = facet["total"][0]["n"] if facet["total"] else 0
+        result["facets"] = {
+            name: [{"value": b["_id"], "count": b["count"]} for b in facet[name]]
+            for name in ("applied", "source", "location")
+        }
+    body = JobSearchResult.model_validate(result).model_dump_json(by_alias=True)
+    return _json_response(body.encode(), response)
+
+@router.get("/stats", response_model=JobStats)
+async def job_stats(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Dashboard counters (applied vs not, per company, per source, per ISO
+    week added) read from the user's materialized stats document.
+    """
+    user_id = ObjectId(current_user["_id"]) if isinstance(current_user["_id"], str) else current_user["_id"]
+
+    version = await get_version(user_id)
+    etag = make_etag(user_id, version, "stats")
+    if etag_matches(if_none_match, etag):
+        return _not_modified(etag)
+    _set_etag(response, etag)
+    return await get_stats(user_id)
 
 @router.get("/{job_id}", response_model=Job)
-def get_job(job_id: str, current_user: dict = Depends(get_current_user)):
+async def get_job(
+    job_id: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    current_user: dict = Depends(get_current_user),
+):
     user_id = ObjectId(current_user["_id"]) if isinstance(current_user["_id"], str) else current_user["_id"]
+
+    version = await get_version(user_id)
+    etag = make_etag(user_id, version, "job", job_id)
+    if etag_matches(if_none_match, etag):
+        return _not_modified(etag)
     
-    job = job_collection.find_one({"_id": ObjectId(job_id), "owner_id": user_id})
+    job = await _jobs().find_one({"_id": ObjectId(job_id), "owner_id": user_id})
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    job_dict = {
-        **job,
-        "_id": str(job["_id"]),
-        "owner_id": str(job["owner_id"])
-    }
-    return Job(**job_dict)
+    _set_etag(response, etag)
+    return _json_response(Job.model_validate(job).model_dump_json(by_alias=True).encode(), response)
 
 @router.put("/{job_id}", response_model=Job)
-def update_job(job_id: str, job: JobCreate, current_user: dict = Depends(get_current_user)):
+async def update_job(
+    job_id: str,
+    job: JobCreate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    current_user: dict = Depends(get_current_user),
+):
     user_id = ObjectId(current_user["_id"]) if isinstance(current_user["_id"], str) else current_user["_id"]
+
+    if if_match:
+        # Optimistic concurrency: the client must hold the current ETag, and
+        # claiming the version fails if another write lands first.
+        version = await get_version(user_id)
+        if not etag_matches(if_match, make_etag(user_id, version, "job", job_id), weak=False):
+            raise HTTPException(status_code=412, detail="Job was modified; reload and retry")
+        if await bump_version(user_id, expected=version) is None:
+            raise HTTPException(status_code=412, detail="Job was modified; reload and retry")
     
-    result = job_collection.update_one(
+    job_collection = _jobs()
+    changes = job.model_dump()
+    # The previous version is needed to adjust the stats counters
+    previous = await job_collection.find_one_and_update(
         {"_id": ObjectId(job_id), "owner_id": user_id},
-        {"$set": job.model_dump()}
+        {"$set": changes},
+        return_document=ReturnDocument.BEFORE,
     )
-    if result.matched_count == 0:
+    if previous is None:
         raise HTTPException(status_code=404, detail="job not found")
+    updated_job = {**previous, **changes}
+    await apply_stats_delta(user_id, added=[updated_job], removed=[previous])
+    
+    version = await bump_version(user_id)
+    _set_etag(response, make_etag(user_id, version, "job", job_id))
     
-    updated_job = job_collection.find_one({"_id": ObjectId(job_id)})
     job_dict = {
         **updated_job,
         "_id": str(updated_job["_id"]),
         "owner_id": str(updated_job["owner_id"])
     }
     
-    # Send Telegram notification about the update
-    try:
-        chat_id = current_user.get("telegram_chat_id")
-        print(f"DEBUG: User telegram_chat_id (update): {chat_id}")
-        if chat_id:
-            message = (
-                f"✏️ Job Updated!\n\n"
-                f"📋 Title: {job_dict['title']}\n"
-                f"🏢 Company: {job_dict['company']}\n"
-                f"📍 Location: {job_dict.get('location', 'Remote/Not Specified')}\n"
-                f"🔗 Link: {job_dict.get('link', 'N/A')}"
-            )
-            print(f"DEBUG: Attempting to send Telegram update notification...")
-            send_message_sync(chat_id, message)
-        else:
-            print("DEBUG: No telegram_chat_id found for user, skipping update notification")
-    except Exception as e:
-        print(f"ERROR: Failed to send Telegram update notification: {str(e)}")
-        # Don't fail job update if notification fails
+    # Send Telegram notification about the update (coalesced per chat)
+    chat_id = current_user.get("telegram_chat_id")
+    if chat_id:
+        notify_job_event(chat_id, "updated", job_dict)
+    debug_event(logger, "job updated", job_id=job_id, notified=bool(chat_id))
     
     return Job(**job_dict)
 
 @router.delete("/{job_id}")
-def delete_job(job_id: str, current_user: dict = Depends(get_current_user)):
+async def delete_job(job_id: str, current_user: dict = Depends(get_current_user)):
     # Verify the job exists and belongs to the user first
-    job = job_collection.find_one({"_id": ObjectId(job_id)})
+    job_collection = _jobs()
+    job = await job_collection.find_one({"_id": ObjectId(job_id)})
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
     if str(job["owner_id"]) != str(current_user["_id"]):
         raise HTTPException(status_code=403, detail="Not authorized to delete this job")
 
-    result = job_collection.delete_one({"_id": ObjectId(job_id)})
-    return {"message": "Job deleted successfully"}
\ No newline at end of file
+    result = await job_collection.delete_one({"_id": ObjectId(job_id)})
+    if result.deleted_count:
+        await delete_changes([job["_id"]])
+        await bump_version(job["owner_id"])
+        await apply_stats_delta(job["owner_id"], removed=[job])
+    return {"message": "Job deleted successfully"}
+
+@router.get("/{job_id}/history", response_model=List[JobChange])
+async def get_job_history(
+    job_id: str,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    The job's full change log from job_changes, newest first, `limit` at a
+    time with the next page's cursor in X-Next-Cursor. Changes older than
+    the retention period have expired.
+    """
+    user_id = ObjectId(current_user["_id"]) if isinstance(current_user["_id"], str) else current_user["_id"]
+    oid = _object_id(job_id)
+    if oid is None or not await _jobs().find_one({"_id": oid, "owner_id": user_id}, {"_id": 1}):
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    after = keyset_after(CHANGE_SORT_FIELDS, decode_cursor(cursor, len(CHANGE_SORT_FIELDS))) if cursor else None
+    rows = await find_changes(oid, after).limit(limit + 1).to_list()
+
+    token = next_cursor(rows, limit, CHANGE_SORT_FIELDS)
+    if token:
+        response.headers["X-Next-Cursor"] = token
+    changes = JobChangeListAdapter.validate_python(rows[:limit])
+    return _json_response(JobChangeListAdapter.dump_json(changes, by_alias=True), response)
@@ -0,0 +1,210 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from changes import change_entry, push_recent, record_changes
+from config import settings
+from db import require_collections
+from scraper import HostLimiters
+from utils.background import BackgroundLoop
+from versions import bump_versions
+
+logger = logging.getLogger(__name__)
+
+# The posting has been taken down
+GONE_STATUSES = {404, 410}
+# Answers from servers that refuse or mishandle HEAD; retried with GET
+HEAD_FALLBACK_STATUSES = {400, 403, 405, 501}
+
+
+@dataclass
+class LinkResult:
+    # Status of the final response after redirects; 0 when none arrived
+    status: int
+    # None when the probe was inconclusive (timeout, 5xx, rate limited...)
+    expired: Optional[bool]
+
+
+def classify(status: int) -> LinkResult:
+    if 200 <= status < 400:
+        return LinkResult(status, False)
+    if status in GONE_STATUSES:
+        return LinkResult(status, True)
+    return LinkResult(status, None)
+
+
+def _checkable(link) -> bool:
+    return isinstance(link, str) and link.startswith(("http://", "https://"))
+
+
+def plan_updates(jobs: List[Dict], results: List[LinkResult], now: datetime,
+                 max_failures: Optional[int] = None) -> Tuple[List[UpdateOne], List[Dict]]:
+    """
+    One UpdateOne per checked job, plus the job_changes documents for jobs
+    whose expired flag flips. A dead link needs a 404/410, or
+    `max_failures` inconclusive probes in a row; any live answer revives it.
+    """
+    if max_failures is None:
+        max_failures = settings.link_check_max_failures
+    ops, changes = [], []
+    for job, result in zip(jobs, results):
+        if not _checkable(job.get("link")):
+            # Nothing to probe; only move the job to the back of the queue
+            ops.append(UpdateOne({"_id": job["_id"]}, {"$set": {"last_checked": now}}))
+            continue
+        fields = {"last_checked": now, "link_status": result.status}
+        expired = result.expired
+        if expired is None:
+            fields["link_failures"] = job.get("link_failures", 0) + 1
+            if fields["link_failures"] >= max_failures:
+                expired = True
+        else:
+            fields["link_failures"] = 0
+        update = {"$set": fields}
+        was_expired = bool(job.get("expired"))
+        if expired is not None and expired != was_expired:
+            entry = change_entry({"expired": {"old": was_expired, "new": expired}}, now)
+            fields["expired"] = expired
+            update["$push"] = push_recent(entry)
+            changes.append({"job_id": job["_id"], "owner_id": job["owner_id"], **entry})
+        ops.append(UpdateOne({"_id": job["_id"]}, update))
+    return ops, changes
+
+
+class LinkChecker(BackgroundLoop):
+    """
+    Background job that revisits each job's link once per interval.
+
+    Due jobs are read oldest last_checked first (never-checked jobs sort
+    first) in batches; their links are probed concurrently over one pooled
+    AsyncClient with HEAD, falling back to a GET that reads only the
+    headers, under the same per-host limits as the scraper. Each batch is
+    written back with one unordered bulk_write that sets last_checked and,
+    when a link dies or comes back, flips `expired` and logs the change.
+    """
+
+    name = "Link checker"
+
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        interval: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        per_host_concurrency: Optional[int] = None,
+        per_host_rate: Optional[float] = None,
+        timeout: Optional[float] = None,
+        max_failures: Optional[int] = None,
+        idle_delay: Optional[float] = None,
+    ):
+        """Arguments left as None come from settings.link_check_*."""
+        super().__init__()
+        self.client = client
+        self._owns_client = client is None
+        self.interval = settings.link_check_interval if interval is None else interval
+        self.batch_size = settings.link_check_batch_size if batch_size is None else batch_size
+        self.concurrency = settings.link_check_concurrency if concurrency is None else concurrency
+        self.timeout = settings.link_check_timeout if timeout is None else timeout
+        self.max_failures = settings.link_check_max_failures if max_failures is None else max_failures
+        self.idle_delay = settings.link_check_idle_delay if idle_delay is None else idle_delay
+        self._limiters = HostLimiters(
+            settings.link_check_per_host_concurrency if per_host_concurrency is None else per_host_concurrency,
+            settings.link_check_per_host_rate if per_host_rate is None else per_host_rate,
+        )
+        self.metrics = {"checked": 0, "expired": 0, "revived": 0, "inconclusive": 0}
+
+    def _http(self) -> httpx.AsyncClient:
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+                headers={"User-Agent": settings.scraper_user_agent},
+                follow_redirects=True,
+            )
+        return self.client
+
+    async def probe(self, url: str) -> LinkResult:
+        """Check one link; network errors are inconclusive (status 0)."""
+        client = self._http()
+        try:
+            async with self._limiters.for_url(url):
+                response = await client.head(url)
+                if response.status_code in HEAD_FALLBACK_STATUSES:
+                    # Streamed so the body is never downloaded
+                    async with client.stream("GET", url) as response:
+                        pass
+            return classify(response.status_code)
+        except (httpx.HTTPError, httpx.InvalidURL) as e:
+            logger.debug("Link check of %s failed: %s", url, e)
+            return LinkResult(0, None)
+
+    async def check_many(self, links: List) -> List[LinkResult]:
+        """Probe `links` concurrently, keeping their order. Non-HTTP links are inconclusive."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def check(link) -> LinkResult:
+            if not _checkable(link):
+                return LinkResult(0, None)
+            async with semaphore:
+                return await self.probe(link)
+
+        return await asyncio.gather(*(check(link) for link in links))
+
+    async def run_once(self) -> int:
+        """Check one batch of due jobs; returns how many were checked."""
+        job_collection = require_collections()[1]
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.interval)
+        cursor = job_collection.find(
+            # Matches never-checked jobs (null/missing) as well as stale ones
+            {"last_checked": {"$not": {"$gt": cutoff}}},
+            {"owner_id": 1, "link": 1, "expired": 1, "link_failures": 1},
+        ).sort("last_checked", 1).limit(self.batch_size)
+        jobs = await cursor.to_list()
+        if not jobs:
+            return 0
+
+        results = await self.check_many([job.get("link") for job in jobs])
+        ops, changes = plan_updates(jobs, results, datetime.now(timezone.utc), self.max_failures)
+        try:
+            await job_collection.bulk_write(ops, ordered=False)
+        except BulkWriteError as e:
+            logger.warning("Link check write-back had %d errors", len(e.details.get("writeErrors", [])))
+        await record_changes(changes)
+        # Only a flipped expired flag invalidates cached job lists; a new
+        # last_checked alone isn't worth breaking every owner's ETags
+        await bump_versions(change["owner_id"] for change in changes)
+
+        self.metrics["checked"] += len(jobs)
+        self.metrics["inconclusive"] += sum(
+            1 for job, r in zip(jobs, results) if r.expired is None and _checkable(job.get("link"))
+        )
+        for change in changes:
+            self.metrics["expired" if change["diff"]["expired"]["new"] else "revived"] += 1
+        return len(jobs)
+
+    async def run(self):
+        while not self._stop.is_set():
+            checked = 0
+            try:
+                checked = await self.run_once()
+            except Exception:
+                logger.exception("Link check cycle failed")
+            # A full batch means more jobs are probably due right away
+            if checked >= self.batch_size:
+                continue
+            await self._sleep(self.idle_delay)
+
+    async def stop(self, timeout: float = 10.0):
+        await super().stop(timeout)
+        if self._owns_client and self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+
+link_checker = LinkChecker()
@@ -1,11 +1,70 @@
+import time
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
-from auth import router as auth_router
+from auth import router as auth_router, user_cache
 from jobs import router as jobs_router
-from telegram_routes import router as telegram_router
-from db import is_db_connected
+from telegram_routes import router as telegram_router, update_processor
+from config import settings
+from db import connect_db, close_db, is_db_connected, ping_db
+from indexes import bootstrap_indexes
+from utils.telegram import notifier
+from utils.security import password_pool_stats, shutdown_password_pool
+from utils.log import configure_logging
+import metrics
+from scraper import close_engine
+from scheduler import scheduler
+from linkcheck import link_checker
+from notifications import coalescer
 
-app = FastAPI()
+
+configure_logging()
+
+# Components that already count their own events are read at scrape time
+metrics.register_stats(
+    "telegram_notifier",
+    lambda: {**notifier.metrics, "queue_depth": notifier.queue_depth()},
+    counters=("enqueued", "sent", "failed", "retried", "dropped"),
+)
+metrics.register_stats(
+    "telegram_webhook",
+    lambda: {**update_processor.metrics, "queue_depth": update_processor.queue_depth()},
+    counters=("received", "duplicates", "rejected", "processed", "failed"),
+)
+metrics.register_stats("user_cache", user_cache.stats, counters=("hits", "misses"))
+metrics.register_stats("link_checker", lambda: link_checker.metrics, counters=tuple(link_checker.metrics))
+metrics.register_stats("password_hasher", password_pool_stats)
+
+
+async def _on_db_ready():
+    # Runs once, when MongoDB first answers a ping (possibly well after startup)
+    await bootstrap_indexes()
+    if settings.scraper_enabled:
+        scheduler.start()
+    if settings.link_check_enabled:
+        link_checker.start()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await connect_db(on_connect=_on_db_ready)
+    await notifier.start()
+    await update_processor.start()
+    try:
+        yield
+    finally:
+        await scheduler.stop()
+        await link_checker.stop()
+        await update_processor.stop()
+        coalescer.flush_all()
+        await notifier.stop()
+        await close_engine()
+        await close_db()
+        shutdown_password_pool()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Configure CORS - must be added before routes
 app.add_middleware(
@@ -14,11 +73,13 @@ app.add_middleware(
         "*"
     ],
     allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
     allow_headers=["*"],
     expose_headers=["*"],
 )
 
+app.add_middleware(metrics.MetricsMiddleware)
+
 app.include_router(auth_router, prefix="/auth")
 app.include_router(jobs_router, prefix="/jobs")
 app.include_router(telegram_router, prefix="/telegram")
@@ -26,7 +87,38 @@ app.include_router(telegram_router, prefix="/telegram")
 
 @app.get("/")
 def status():
-    return {
-        "message": "AutoTracker app is running!",
-        "db_connected": is_db_connected(),
-    }
\ No newline at end of file
+    return {"message": "AutoTracker app is running!"}
+
+
+@app.get("/healthz", include_in_schema=False)
+def liveness():
+    # The process is up and serving; no I/O so probes stay cheap
+    return {"status": "ok"}
+
+
+# (checked_at, ready) of the last MongoDB ping
+_readiness = (0.0, False)
+
+
+@app.get("/readyz", include_in_schema=False)
+async def readiness():
+    """
+    Ready while MongoDB answers a ping. The result is reused for
+    READINESS_CACHE_TTL seconds so frequent probes don't each cost a round-trip.
+    """
+    global _readiness
+    checked_at, ready = _readiness
+    now = time.monotonic()
+    if not is_db_connected():
+        # Still connecting in the background; don't wait on another ping
+        ready = False
+    elif now - checked_at >= settings.readiness_cache_ttl:
+        ready = await ping_db()
+        _readiness = (now, ready)
+    body = {"status": "ready" if ready else "unavailable", "db_connected": ready}
+    return JSONResponse(body, status_code=200 if ready else 503)
+
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
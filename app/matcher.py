@@ -0,0 +1,116 @@
+import re
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, Set, Tuple
+
+# Keeps tokens like "c++", "c#" and "node.js" intact
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+
+def tokenize(text: str) -> List[str]:
+    # Trailing dots are sentence punctuation ("... with Python.")
+    return [t.rstrip(".") for t in _TOKEN_RE.findall((text or "").lower()) if t.rstrip(".")]
+
+
+def normalize_skill(skill: str) -> str:
+    return " ".join(tokenize(skill))
+
+
+class SkillMatcher:
+    """
+    Matches job text against the union of every user's skills in one scan.
+
+    Skills are indexed by their first token; scanning a job walks its tokens
+    once and only compares the (usually zero or one) phrases that start with
+    each token, so cost is O(job tokens) instead of O(users x skills).
+    User skill changes update the index incrementally.
+    """
+
+    def __init__(self):
+        # user -> {normalized skill: skill as the user wrote it}
+        self._user_skills: Dict[Hashable, Dict[str, str]] = {}
+        # normalized skill -> users who track it
+        self._subscribers: Dict[str, Set[Hashable]] = defaultdict(set)
+        # first token -> skill phrases (token tuples) starting with it
+        self._index: Dict[str, Set[Tuple[str, ...]]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def set_user_skills(self, user_id: Hashable, skills: Iterable[str]):
+        """Replace a user's skills, touching only the skills that changed."""
+        new = {}
+        for skill in skills:
+            key = normalize_skill(skill)
+            if key:
+                new.setdefault(key, skill.strip())
+        old = self._user_skills.get(user_id, {})
+        for key in old.keys() - new.keys():
+            self._unsubscribe(user_id, key)
+        for key in new.keys() - old.keys():
+            self._subscribe(user_id, key)
+        if new:
+            self._user_skills[user_id] = new
+        else:
+            self._user_skills.pop(user_id, None)
+
+    def remove_user(self, user_id: Hashable):
+        self.set_user_skills(user_id, [])
+
+    def _subscribe(self, user_id: Hashable, key: str):
+        if not self._subscribers[key]:
+            phrase = tuple(key.split(" "))
+            self._index[phrase[0]].add(phrase)
+        self._subscribers[key].add(user_id)
+
+    def _unsubscribe(self, user_id: Hashable, key: str):
+        users = self._subscribers.get(key)
+        if users is None:
+            return
+        users.discard(user_id)
+        if not users:
+            del self._subscribers[key]
+            phrase = tuple(key.split(" "))
+            phrases = self._index[phrase[0]]
+            phrases.discard(phrase)
+            if not phrases:
+                del self._index[phrase[0]]
+
+    def users(self) -> List[Hashable]:
+        return list(self._user_skills)
+
+    def subscribers(self, key: str) -> Set[Hashable]:
+        """Users tracking the normalized skill `key`."""
+        return set(self._subscribers.get(key, ()))
+
+    def skills(self) -> Dict[str, int]:
+        """Every distinct normalized skill with its subscriber count."""
+        return {key: len(users) for key, users in self._subscribers.items()}
+
+    def match_skills(self, text: str) -> Set[str]:
+        """Normalized skills that occur in `text`."""
+        tokens = tokenize(text)
+        found = set()
+        index = self._index
+        for i, token in enumerate(tokens):
+            phrases = index.get(token)
+            if not phrases:
+                continue
+            for phrase in phrases:
+                if len(phrase) == 1 or tuple(tokens[i:i + len(phrase)]) == phrase:
+                    found.add(" ".join(phrase))
+        return found
+
+    def match(self, text: str) -> Dict[Hashable, List[str]]:
+        """{user_id: [matched skills as the user wrote them]} for one text."""
+        matches: Dict[Hashable, List[str]] = defaultdict(list)
+        for key in self.match_skills(text):
+            for user_id in self._subscribers[key]:
+                matches[user_id].append(self._user_skills[user_id][key])
+        return dict(matches)
+
+    def match_job(self, job: Dict) -> Dict[Hashable, List[str]]:
+        return self.match(f"{job.get('title', '')}\n{job.get('description', '')}")
+
+
+# Process-wide matcher kept in sync with users' skills
+matcher = SkillMatcher()
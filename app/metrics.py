@@ -0,0 +1,217 @@
+import bisect
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from pymongo import monitoring
+
+# Prometheus text exposition format, served by GET /metrics
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Seconds; tuned for API handlers and single MongoDB commands
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Iterable[str] = ()):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def expose(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = list(self._values.items())
+        lines += [f"{self.name}{_labels(self.labels, k)} {_number(v)}" for k, v in items]
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: Iterable[str] = (), buckets=DEFAULT_BUCKETS):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self.buckets = tuple(buckets)
+        # label values -> [bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(label_values)
+            if row is None:
+                row = self._values[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            row[index] += 1
+            row[-1] += value
+
+    def expose(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._values.items()]
+        for key, row in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), row):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, key)} {_number(row[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.labels, key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    """
+    Metrics owned here plus collectors: callables returning
+    (name, type, help, [(labels dict, value)]) read at scrape time, so
+    components that already keep counters (the Telegram notifier, caches)
+    cost nothing extra per event.
+    """
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors: List[Callable[[], Iterable[tuple]]] = []
+
+    def counter(self, name, help, labels=()) -> Counter:
+        metric = Counter(name, help, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help, labels=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(name, help, labels, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def collector(self, func: Callable[[], Iterable[tuple]]):
+        self._collectors.append(func)
+        return func
+
+    def expose(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines += metric.expose()
+        for collect in self._collectors:
+            for name, kind, help, samples in collect():
+                lines += [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+                for labels, value in samples:
+                    names = tuple(labels)
+                    lines.append(f"{name}{_labels(names, tuple(labels[n] for n in names))} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.",
+    ("method", "route", "status"),
+)
+mongo_command_duration = registry.histogram(
+    "mongodb_command_duration_seconds", "MongoDB command latency as reported by the driver.",
+    ("command", "collection", "outcome"),
+)
+telegram_send_duration = registry.histogram(
+    "telegram_send_duration_seconds", "Telegram sendMessage latency, per attempt.",
+    ("outcome",), buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing every HTTP request by its route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The router stores the matched route in the scope; unmatched
+            # paths share one label so arbitrary URLs can't add series
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            http_request_duration.observe(time.perf_counter() - started, scope["method"], path, status)
+
+
+# Commands whose first value is not a collection name
+_NO_COLLECTION = {"ping", "hello", "ismaster", "isMaster", "endSessions", "buildInfo", "saslStart", "saslContinue"}
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    """Records every command's driver-measured duration by command and collection."""
+
+    def __init__(self, max_inflight: int = 10000):
+        self._inflight: Dict[Tuple, str] = {}
+        self._max_inflight = max_inflight
+
+    def started(self, event: monitoring.CommandStartedEvent):
+        collection = ""
+        if event.command_name not in _NO_COLLECTION:
+            value = event.command.get(event.command_name)
+            if isinstance(value, str):
+                collection = value
+        if len(self._inflight) < self._max_inflight:
+            self._inflight[(event.request_id, event.connection_id)] = collection
+
+    def _finished(self, event, outcome: str):
+        collection = self._inflight.pop((event.request_id, event.connection_id), "")
+        mongo_command_duration.observe(event.duration_micros / 1e6, event.command_name, collection, outcome)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent):
+        self._finished(event, "ok")
+
+    def failed(self, event: monitoring.CommandFailedEvent):
+        self._finished(event, "error")
+
+
+mongo_listener = MongoCommandListener()
+
+
+def _dict_samples(prefix: str, values: Dict, kinds: Optional[Dict[str, str]] = None):
+    """Turn a flat {name: number} stats dict into one metric per key."""
+    for key, value in values.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        kind = (kinds or {}).get(key, "gauge")
+        name = f"{prefix}_{key}_total" if kind == "counter" else f"{prefix}_{key}"
+        yield name, kind, f"{prefix.replace('_', ' ')} {key.replace('_', ' ')}", [({}, value)]
+
+
+def register_stats(prefix: str, source: Callable[[], Dict], counters: Iterable[str] = ()):
+    """Expose a component's stats dict at scrape time; keys in `counters` are counters."""
+    kinds = {key: "counter" for key in counters}
+    registry.collector(lambda: _dict_samples(prefix, source(), kinds))
+
+
+def render() -> str:
+    return registry.expose()
@@ -1,9 +1,11 @@
 from datetime import datetime, timezone
-from typing import List, Optional, Any
+from typing import Annotated, Dict, List, Optional, Any
 from bson import ObjectId
-from pydantic import BaseModel, Field, GetCoreSchemaHandler
+from pydantic import BaseModel, BeforeValidator, Field, GetCoreSchemaHandler, TypeAdapter
 from pydantic_core import CoreSchema, core_schema
 
+from config import settings
+
 
 # ---------- USER MODELS ----------
 class UserCreate(BaseModel):
@@ -35,6 +37,14 @@ class PyObjectId(str):
         )
 
 
+def _stringify_object_id(value: Any) -> Any:
+    return str(value) if isinstance(value, ObjectId) else value
+
+# str field that also accepts a raw ObjectId, so Mongo documents can be
+# validated as-is instead of being copied with str() ids first
+ObjectIdStr = Annotated[str, BeforeValidator(_stringify_object_id)]
+
+
 # ---------- JOB MODELS ----------
 class JobBase(BaseModel):
     title: str
@@ -46,14 +56,18 @@ class JobBase(BaseModel):
 
 
 class Job(JobBase):
-    id: str = Field(default_factory=lambda: str(ObjectId()), alias="_id")
-    owner_id: str
+    id: ObjectIdStr = Field(default_factory=lambda: str(ObjectId()), alias="_id")
+    owner_id: ObjectIdStr
     date_added: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     source: Optional[str] = None
     external_id: Optional[str] = None  # e.g. job posting unique id or hash
     skills_matched: List[str] = []
     last_checked: Optional[datetime] = None
-    change_history: List[dict] = []  # [{'changed_at': datetime, 'diff': {...}}]
+    # Set by the link checker once the posting's link is gone
+    expired: bool = False
+    # Newest few diffs only, [{'changed_at': datetime, 'diff': {...}}];
+    # the full log is in job_changes (GET /jobs/{id}/history)
+    change_history: List[dict] = []
 
     model_config = {
         "populate_by_name": True,
@@ -61,6 +75,32 @@ class Job(JobBase):
     }
 
 
+class JobSummary(BaseModel):
+    """Job without the heavy description/change_history fields (list "summary" view)."""
+    id: ObjectIdStr = Field(alias="_id")
+    owner_id: ObjectIdStr
+    title: str
+    company: str
+    location: Optional[str] = None
+    link: str
+    applied: bool = False
+    date_added: datetime
+    source: Optional[str] = None
+    external_id: Optional[str] = None
+    skills_matched: List[str] = []
+    last_checked: Optional[datetime] = None
+    expired: bool = False
+
+    model_config = {
+        "populate_by_name": True,
+    }
+
+
+# Cached adapters for validating/serializing whole result lists in one call
+JobListAdapter = TypeAdapter(List[Job])
+JobSummaryListAdapter = TypeAdapter(List[JobSummary])
+
+
 class JobCreate(JobBase):
     skills_matched: List[str] = []
     source: Optional[str] = None
@@ -72,5 +112,90 @@ class JobCreate(JobBase):
     }
 
 
+class JobPatch(BaseModel):
+    """Partial job update; only the fields that are set to a value are changed."""
+    title: Optional[str] = None
+    company: Optional[str] = None
+    location: Optional[str] = None
+    description: Optional[str] = None
+    link: Optional[str] = None
+    applied: Optional[bool] = None
+    source: Optional[str] = None
+    skills_matched: Optional[List[str]] = None
+
+
+# ---------- BULK JOB MODELS ----------
+class BulkJobCreate(BaseModel):
+    jobs: List[JobCreate] = Field(min_length=1, max_length=settings.bulk_max_items)
+
+
+class BulkJobUpdateItem(JobPatch):
+    id: str
+
+
+class BulkJobUpdate(BaseModel):
+    updates: List[BulkJobUpdateItem] = Field(min_length=1, max_length=settings.bulk_max_items)
+
+
+class BulkJobDelete(BaseModel):
+    ids: List[str] = Field(min_length=1, max_length=settings.bulk_max_items)
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    id: Optional[str] = None
+    status: str  # created | updated | deleted | not_found | invalid | error
+    error: Optional[str] = None
+
+
+class BulkResult(BaseModel):
+    results: List[BulkItemResult]
+    succeeded: int
+    failed: int
+
+
+# ---------- SEARCH MODELS ----------
+class JobSearchHit(JobSummary):
+    score: float  # text relevance
+
+
+class FacetCount(BaseModel):
+    value: Any
+    count: int
+
+
+class JobSearchResult(BaseModel):
+    results: List[JobSearchHit]
+    next_cursor: Optional[str] = None
+    # Only computed for the first page (no cursor)
+    total: Optional[int] = None
+    facets: Optional[Dict[str, List[FacetCount]]] = None
+
+
+class JobChange(BaseModel):
+    id: ObjectIdStr = Field(alias="_id")
+    job_id: ObjectIdStr
+    changed_at: datetime
+    diff: Dict[str, Any]
+
+    model_config = {
+        "populate_by_name": True,
+    }
+
+
+JobChangeListAdapter = TypeAdapter(List[JobChange])
+
+
+# ---------- STATS MODELS ----------
+class JobStats(BaseModel):
+    total: int
+    applied: int
+    not_applied: int
+    by_company: Dict[str, int]
+    by_source: Dict[str, int]
+    by_week: Dict[str, int]  # ISO week ("2025-W07") -> jobs added
+    updated_at: Optional[datetime] = None
+
+
 class SkillsUpdate(BaseModel):
     skills: List[str]
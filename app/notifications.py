@@ -0,0 +1,155 @@
+import asyncio
+import logging
+from typing import Callable, Dict, List, Optional
+
+from config import settings
+from utils.telegram import enqueue_message
+
+logger = logging.getLogger(__name__)
+
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+_HEADINGS = {"new": "🆕 New Job Added!", "updated": "✏️ Job Updated!"}
+_ICONS = {"new": "🆕", "updated": "✏️"}
+
+
+def format_job_message(kind: str, job: Dict) -> str:
+    """The single-job message sent when only one event is pending."""
+    return (
+        f"{_HEADINGS[kind]}\n\n"
+        f"📋 Title: {job.get('title')}\n"
+        f"🏢 Company: {job.get('company')}\n"
+        f"📍 Location: {job.get('location') or 'Remote/Not Specified'}\n"
+        f"🔗 Link: {job.get('link') or 'N/A'}"
+    )
+
+
+def format_digest(events: List[tuple], top_n: Optional[int] = None) -> List[str]:
+    """
+    Summarize (kind, job) events as "12 new, 3 updated" plus the first
+    `top_n` jobs, split into messages under Telegram's size limit.
+    """
+    if top_n is None:
+        top_n = settings.notify_digest_top
+    counts = {"new": 0, "updated": 0}
+    for kind, _ in events:
+        counts[kind] += 1
+    summary = ", ".join(f"{n} {kind}" for kind, n in counts.items() if n)
+    lines = [f"📬 Job updates: {summary}", ""]
+    for kind, job in events[:top_n]:
+        entry = f"{_ICONS[kind]} {job.get('title')} — {job.get('company')}"
+        if job.get("link"):
+            entry += f"\n{job['link']}"
+        lines.append(entry)
+    if len(events) > top_n:
+        lines.append(f"…and {len(events) - top_n} more")
+
+    messages, current = [], ""
+    for line in lines:
+        line = line[:TELEGRAM_MESSAGE_LIMIT - 1]
+        candidate = f"{current}\n{line}" if current else line
+        if len(candidate) > TELEGRAM_MESSAGE_LIMIT:
+            messages.append(current)
+            candidate = line
+        current = candidate
+    if current:
+        messages.append(current)
+    return messages
+
+
+class NotificationCoalescer:
+    """
+    Buffers job events per Telegram chat and flushes them once per window:
+    a lone event goes out as the usual single-job message, anything more
+    as one digest. Repeated events for the same job collapse into one.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str, str], bool] = enqueue_message,
+        window: Optional[float] = None,
+        top_n: Optional[int] = None,
+    ):
+        """Arguments left as None come from settings.notify_*."""
+        self.send = send
+        self.window = settings.notify_coalesce_window if window is None else window
+        self.top_n = settings.notify_digest_top if top_n is None else top_n
+        # chat_id -> {job key: (kind, job)}, in arrival order
+        self._pending: Dict[str, Dict[str, tuple]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+
+    def job_event(self, chat_id: Optional[str], kind: str, job: Dict):
+        """Record that `job` was created ("new") or changed ("updated")."""
+        if not chat_id:
+            return
+        chat_id = str(chat_id)
+        if self.window <= 0:
+            self.send(chat_id, format_job_message(kind, job))
+            return
+        self._buffer(chat_id, kind, job)
+        self._schedule(chat_id)
+
+    def job_events(self, chat_id: Optional[str], events: List[tuple]):
+        """Record a batch of (kind, job) events, e.g. from a bulk write, as one delivery."""
+        if not chat_id or not events:
+            return
+        chat_id = str(chat_id)
+        for kind, job in events:
+            self._buffer(chat_id, kind, job)
+        if self.window <= 0:
+            self.flush(chat_id)
+        else:
+            self._schedule(chat_id)
+
+    def _buffer(self, chat_id: str, kind: str, job: Dict):
+        events = self._pending.setdefault(chat_id, {})
+        key = str(job.get("_id") or job.get("external_id") or id(job))
+        previous = events.pop(key, None)
+        # A job created and then edited in the same window is still "new"
+        if previous is not None and previous[0] == "new":
+            kind = "new"
+        events[key] = (kind, job)
+
+    def _schedule(self, chat_id: str):
+        if chat_id not in self._timers:
+            loop = asyncio.get_running_loop()
+            self._timers[chat_id] = loop.call_later(self.window, self.flush, chat_id)
+
+    def flush(self, chat_id: str):
+        timer = self._timers.pop(chat_id, None)
+        if timer is not None:
+            timer.cancel()
+        events = list(self._pending.pop(chat_id, {}).values())
+        if not events:
+            return
+        if len(events) == 1:
+            kind, job = events[0]
+            self.send(chat_id, format_job_message(kind, job))
+            return
+        # Newest first
+        for message in format_digest(events[::-1], self.top_n):
+            self.send(chat_id, message)
+
+    def flush_all(self):
+        for chat_id in list(self._pending):
+            self.flush(chat_id)
+
+
+coalescer = NotificationCoalescer()
+
+
+def notify_job_event(chat_id: Optional[str], kind: str, job: Dict):
+    """Queue a job notification; it is delivered with the chat's next digest."""
+    try:
+        coalescer.job_event(chat_id, kind, job)
+    except Exception as e:
+        # Notifications must never fail the write that triggered them
+        logger.error("Failed to queue job notification for %s: %s", chat_id, e)
+
+
+def notify_job_events(chat_id: Optional[str], events: List[tuple]):
+    """Queue several (kind, job) notifications to be delivered together."""
+    try:
+        coalescer.job_events(chat_id, events)
+    except Exception as e:
+        logger.error("Failed to queue job notifications for %s: %s", chat_id, e)
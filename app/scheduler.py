@@ -0,0 +1,182 @@
+import asyncio
+import hashlib
+import logging
+import random
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, Hashable, List, Optional, Set
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from config import settings
+from db import require_collections, require_database
+from ingest import ingest_jobs
+from matcher import SkillMatcher, matcher as default_matcher
+from notifications import notify_job_event
+from scraper import ScrapeEngine, fetch_key, get_engine, scrape_all
+from utils.background import BackgroundLoop
+
+logger = logging.getLogger(__name__)
+
+STATE_COLLECTION = "scrape_state"
+
+
+class ScrapeScheduler(BackgroundLoop):
+    """
+    Background scraper that runs each distinct skill query once per interval.
+
+    Every user's skills are folded into the shared SkillMatcher, so a skill
+    followed by hundreds of users is one query. Due queries run most-followed
+    first; each (source, query) remembers its ETag/Last-Modified in
+    scrape_state so unchanged pages are skipped with a 304 until the query
+    gains followers, who need the full listing once. Fetched jobs are
+    matched against all users in one pass and ingested per user.
+    """
+
+    name = "Scrape scheduler"
+
+    def __init__(
+        self,
+        engine: Optional[ScrapeEngine] = None,
+        matcher: Optional[SkillMatcher] = None,
+        interval: Optional[float] = None,
+        jitter: Optional[float] = None,
+        concurrency: Optional[int] = None,
+        refresh_interval: Optional[float] = None,
+    ):
+        """Arguments left as None come from settings.scrape_*."""
+        super().__init__()
+        self.engine = engine
+        self.matcher = matcher or default_matcher
+        self.interval = settings.scrape_interval if interval is None else interval
+        self.jitter = settings.scrape_jitter if jitter is None else jitter
+        self.concurrency = settings.scrape_concurrency if concurrency is None else concurrency
+        self.refresh_interval = settings.scrape_refresh_interval if refresh_interval is None else refresh_interval
+        self._next_run: Dict[str, float] = {}
+        # query -> users following it as of the last refresh
+        self._subscribed: Dict[str, Set[Hashable]] = {}
+        self._refreshed_at = 0.0
+
+    def _jittered(self, seconds: float) -> float:
+        return seconds * (1 + random.uniform(-self.jitter, self.jitter))
+
+    async def refresh_queries(self):
+        """Reload users' skills into the matcher and reconcile the query set."""
+        user_collection = require_collections()[0]
+        seen = set()
+        async for user in user_collection.find({"skills.0": {"$exists": True}}, {"skills": 1}):
+            user_id = str(user["_id"])
+            seen.add(user_id)
+            self.matcher.set_user_skills(user_id, user.get("skills", []))
+        for user_id in self.matcher.users():
+            if user_id not in seen:
+                self.matcher.remove_user(user_id)
+
+        queries = self.matcher.skills()
+        now = time.monotonic()
+        for query in queries:
+            users = self.matcher.subscribers(query)
+            soon = now + random.uniform(0, self.jitter * 60)
+            if query not in self._next_run:
+                # New queries start soon, spread over a small window
+                self._next_run[query] = soon
+            elif users - self._subscribed.get(query, set()):
+                # New followers haven't seen the current listing yet
+                self._next_run[query] = min(self._next_run[query], soon)
+            self._subscribed[query] = users
+        for query in list(self._next_run):
+            if query not in queries:
+                del self._next_run[query]
+                self._subscribed.pop(query, None)
+        self._refreshed_at = now
+
+    def due_queries(self) -> List[str]:
+        """Queries whose time has come, most-subscribed first."""
+        now = time.monotonic()
+        subscribers = self.matcher.skills()
+        due = [q for q, at in self._next_run.items() if at <= now]
+        return sorted(due, key=lambda q: -subscribers.get(q, 0))
+
+    def _audience(self, query: str) -> str:
+        """Digest of the users following `query`."""
+        users = "\n".join(sorted(str(u) for u in self.matcher.subscribers(query)))
+        return hashlib.sha1(users.encode()).hexdigest()
+
+    async def run_query(self, query: str):
+        engine = self.engine or get_engine()
+        state = require_database().get_collection(STATE_COLLECTION)
+        keys = [fetch_key(adapter.name, query) for adapter in engine.adapters]
+        # Validators only hold for the users who were matched against the
+        # full listing; anyone who followed the query since would never see
+        # the postings behind a 304, so a changed audience refetches in full
+        audience = self._audience(query)
+        validators = {
+            doc["_id"]: doc
+            async for doc in state.find({"_id": {"$in": keys}})
+            if doc.get("audience") == audience
+        }
+        results = {}
+        per_user: Dict[str, List[Dict]] = defaultdict(list)
+        async for job in scrape_all([query], engine=engine, validators=validators, results=results):
+            for user_id, skills in self.matcher.match_job(job).items():
+                per_user[user_id].append({**job, "skills_matched": sorted(skills)})
+
+        now = datetime.now(timezone.utc)
+        ops = []
+        for key, result in results.items():
+            update = {"last_checked": now, "last_status": result.status}
+            if result.status and result.status != 304:
+                update.update({"etag": result.etag, "last_modified": result.last_modified, "audience": audience})
+            ops.append(UpdateOne({"_id": key}, {"$set": update}, upsert=True))
+        if ops:
+            await state.bulk_write(ops, ordered=False)
+        if not per_user:
+            return
+        events = {}
+        for user_id, jobs in per_user.items():
+            result = await ingest_jobs(user_id, jobs)
+            if result.events:
+                events[user_id] = result.events
+        await self._notify(events)
+
+    async def _notify(self, events: Dict[str, List[tuple]]):
+        if not events:
+            return
+        user_collection = require_collections()[0]
+        users = user_collection.find(
+            {"_id": {"$in": [ObjectId(u) for u in events]}, "telegram_chat_id": {"$nin": [None, ""]}},
+            {"telegram_chat_id": 1},
+        )
+        async for user in users:
+            for kind, job in events[str(user["_id"])]:
+                notify_job_event(user["telegram_chat_id"], kind, job)
+
+    async def _run_guarded(self, query: str, semaphore: asyncio.Semaphore):
+        async with semaphore:
+            try:
+                await self.run_query(query)
+            except Exception:
+                logger.exception("Scheduled scrape for %r failed", query)
+            finally:
+                if query in self._next_run:
+                    self._next_run[query] = time.monotonic() + self._jittered(self.interval)
+
+    async def run(self):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        while not self._stop.is_set():
+            try:
+                if time.monotonic() - self._refreshed_at >= self.refresh_interval:
+                    await self.refresh_queries()
+                due = self.due_queries()
+                if due:
+                    await asyncio.gather(*(self._run_guarded(q, semaphore) for q in due))
+            except Exception:
+                logger.exception("Scrape scheduler cycle failed")
+            upcoming = min(self._next_run.values(), default=time.monotonic() + self.refresh_interval)
+            delay = max(1.0, min(upcoming - time.monotonic(), self.refresh_interval))
+            await self._sleep(delay)
+
+
+scheduler = ScrapeScheduler()
@@ -1,7 +1,292 @@
-from typing import List, Dict
+import asyncio
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, Iterable, List, Optional
 
-# Scraping disabled. Keep a stable API for callers.
+import httpx
 
-def scrape_all(skills: List[str]) -> List[Dict]:
-    """Return no jobs. Scraping is currently disabled."""
-    return []
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+def _strip_html(text: Optional[str]) -> str:
+    return _TAG_RE.sub(" ", text or "").strip()
+
+
+class SourceAdapter:
+    """
+    One job board. Subclasses say how to query it for a skill and how to
+    turn its response into normalized job dicts with the keys
+    title, company, location, description, link, source, external_id.
+    """
+
+    name = "source"
+    # Settings field holding the default endpoint
+    url_setting = ""
+
+    def __init__(self, base_url: Optional[str] = None):
+        self.base_url = base_url or (getattr(settings, self.url_setting) if self.url_setting else "")
+
+    def build_request(self, skill: str) -> Dict:
+        """Return httpx.request kwargs (at least "url") for a skill query."""
+        raise NotImplementedError
+
+    def parse(self, payload, skill: str) -> Iterable[Dict]:
+        raise NotImplementedError
+
+    def normalize(self, source_id, **fields) -> Dict:
+        return {
+            "title": (fields.get("title") or "").strip(),
+            "company": (fields.get("company") or "").strip(),
+            "location": fields.get("location") or None,
+            "description": _strip_html(fields.get("description")),
+            "link": fields.get("link") or "",
+            "source": self.name,
+            "external_id": f"{self.name}:{source_id}",
+        }
+
+
+class RemotiveAdapter(SourceAdapter):
+    name = "remotive"
+    url_setting = "scraper_remotive_url"
+
+    def build_request(self, skill: str) -> Dict:
+        return {"url": self.base_url, "params": {"search": skill}}
+
+    def parse(self, payload, skill: str) -> Iterable[Dict]:
+        for item in payload.get("jobs", []):
+            yield self.normalize(
+                item["id"],
+                title=item.get("title"),
+                company=item.get("company_name"),
+                location=item.get("candidate_required_location"),
+                description=item.get("description"),
+                link=item.get("url"),
+            )
+
+
+class RemoteOKAdapter(SourceAdapter):
+    name = "remoteok"
+    url_setting = "scraper_remoteok_url"
+
+    def build_request(self, skill: str) -> Dict:
+        return {"url": self.base_url, "params": {"tag": skill}}
+
+    def parse(self, payload, skill: str) -> Iterable[Dict]:
+        for item in payload:
+            # The first element is a legal notice, not a job
+            if "id" not in item:
+                continue
+            yield self.normalize(
+                item["id"],
+                title=item.get("position"),
+                company=item.get("company"),
+                location=item.get("location"),
+                description=item.get("description"),
+                link=item.get("url"),
+            )
+
+
+DEFAULT_ADAPTERS = [RemotiveAdapter, RemoteOKAdapter]
+
+
+@dataclass
+class FetchResult:
+    """Outcome of one adapter query. status 304 means the page was unchanged."""
+    status: int
+    jobs: List[Dict] = field(default_factory=list)
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+def fetch_key(adapter_name: str, skill: str) -> str:
+    """Identifies one adapter query, e.g. for storing its validators."""
+    return f"{adapter_name}:{skill}"
+
+
+class HostLimiter:
+    """Caps in-flight requests and request rate for one host."""
+
+    def __init__(self, concurrency: int, rate: float):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+
+    async def __aenter__(self):
+        await self.semaphore.acquire()
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.interval
+        if slot > now:
+            try:
+                await asyncio.sleep(slot - now)
+            except BaseException:
+                # Cancelled while waiting for the slot: __aexit__ won't run
+                self.semaphore.release()
+                raise
+
+    async def __aexit__(self, *exc):
+        self.semaphore.release()
+
+
+class HostLimiters:
+    """One HostLimiter per host, created on first use with shared limits."""
+
+    def __init__(self, concurrency: int, rate: float):
+        self.concurrency = concurrency
+        self.rate = rate
+        self._limiters: Dict[str, HostLimiter] = {}
+
+    def for_url(self, url: str) -> HostLimiter:
+        host = httpx.URL(url).host
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            limiter = HostLimiter(self.concurrency, self.rate)
+            self._limiters[host] = limiter
+        return limiter
+
+
+class ScrapeEngine:
+    """
+    Fans skill queries out to every adapter over one pooled AsyncClient,
+    honouring per-host concurrency and rate limits, and streams normalized
+    jobs as soon as each query finishes.
+    """
+
+    def __init__(
+        self,
+        adapters: Optional[List[SourceAdapter]] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        per_host_concurrency: Optional[int] = None,
+        per_host_rate: Optional[float] = None,
+        max_connections: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
+        """Arguments left as None come from settings.scraper_*."""
+        if max_connections is None:
+            max_connections = settings.scraper_max_connections
+        self.adapters = adapters if adapters is not None else [cls() for cls in DEFAULT_ADAPTERS]
+        self._owns_client = client is None
+        self.client = client or httpx.AsyncClient(
+            timeout=settings.scraper_timeout if timeout is None else timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            headers={"User-Agent": settings.scraper_user_agent},
+            follow_redirects=True,
+        )
+        self._limiters = HostLimiters(
+            settings.scraper_per_host_concurrency if per_host_concurrency is None else per_host_concurrency,
+            settings.scraper_per_host_rate if per_host_rate is None else per_host_rate,
+        )
+
+    async def fetch(self, adapter: SourceAdapter, skill: str, validators: Optional[Dict] = None) -> FetchResult:
+        """
+        Run one adapter query; errors are logged and yield no jobs (status 0).
+        `validators` may carry the "etag"/"last_modified" from a previous
+        fetch so unchanged pages come back as a cheap 304.
+        """
+        request = adapter.build_request(skill)
+        validators = validators or {}
+        headers = dict(request.pop("headers", {}))
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        try:
+            async with self._limiters.for_url(request["url"]):
+                response = await self.client.request("GET", headers=headers, **request)
+            if response.status_code == 304:
+                return FetchResult(
+                    status=304,
+                    etag=validators.get("etag"),
+                    last_modified=validators.get("last_modified"),
+                )
+            response.raise_for_status()
+            return FetchResult(
+                status=response.status_code,
+                jobs=list(adapter.parse(response.json(), skill)),
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+        except (httpx.HTTPError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Scrape of %s for %r failed: %s", adapter.name, skill, e)
+            return FetchResult(status=0)
+
+    async def _fetch_keyed(self, adapter: SourceAdapter, skill: str, validators: Optional[Dict]):
+        key = fetch_key(adapter.name, skill)
+        return key, await self.fetch(adapter, skill, validators)
+
+    async def stream(
+        self,
+        skills: Iterable[str],
+        validators: Optional[Dict[str, Dict]] = None,
+        results: Optional[Dict[str, FetchResult]] = None,
+    ) -> AsyncIterator[Dict]:
+        """
+        Yield each distinct job (by external_id) once, as queries complete.
+        `validators` maps fetch_key(adapter, skill) to a previous fetch's
+        etag/last_modified; each query's FetchResult is stored in `results`
+        under the same key.
+        """
+        validators = validators or {}
+        tasks = [
+            asyncio.create_task(self._fetch_keyed(adapter, skill, validators.get(fetch_key(adapter.name, skill))))
+            for skill in dict.fromkeys(skills)
+            for adapter in self.adapters
+        ]
+        seen = set()
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                key, result = await next_done
+                if results is not None:
+                    results[key] = result
+                for job in result.jobs:
+                    if job["external_id"] in seen:
+                        continue
+                    seen.add(job["external_id"])
+                    yield job
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def aclose(self):
+        if self._owns_client:
+            await self.client.aclose()
+
+
+_engine: Optional[ScrapeEngine] = None
+
+
+def get_engine() -> ScrapeEngine:
+    """Process-wide engine so every scrape shares one connection pool."""
+    global _engine
+    if _engine is None:
+        _engine = ScrapeEngine()
+    return _engine
+
+
+async def close_engine():
+    global _engine
+    if _engine is not None:
+        await _engine.aclose()
+        _engine = None
+
+
+async def scrape_all(
+    skills: List[str],
+    engine: Optional[ScrapeEngine] = None,
+    validators: Optional[Dict[str, Dict]] = None,
+    results: Optional[Dict[str, FetchResult]] = None,
+) -> AsyncIterator[Dict]:
+    """
+    Stream normalized jobs for the given skills from every configured source.
+    See ScrapeEngine.stream for conditional fetching with `validators`.
+    """
+    engine = engine or get_engine()
+    async for job in engine.stream(skills, validators, results):
+        yield job
@@ -0,0 +1,183 @@
+import asyncio
+import sys
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional
+
+from bson import ObjectId
+
+from db import close_db, connect_db, require_collections, require_database
+
+# One document per user, kept current with $inc by every job write:
+# {"_id": owner_id, "total": n, "applied": n,
+#  "by_company": {key: n}, "by_source": {key: n}, "by_week": {"2025-W07": n}}
+STATS_COLLECTION = "job_stats"
+# Map key for jobs without a source/company
+NONE_KEY = "(none)"
+
+# Field names may not contain "." or start with "$"; percent-encode them
+_ESCAPES = (("%", "%25"), (".", "%2E"), ("$", "%24"))
+
+
+def escape_key(value) -> str:
+    key = NONE_KEY if value in (None, "") else str(value)
+    for char, code in _ESCAPES:
+        key = key.replace(char, code)
+    return key
+
+
+def unescape_key(key: str) -> str:
+    for char, code in reversed(_ESCAPES):
+        key = key.replace(code, char)
+    return key
+
+
+def week_key(date: Optional[datetime]) -> Optional[str]:
+    if date is None:
+        return None
+    year, week, _ = date.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _collection():
+    return require_database().get_collection(STATS_COLLECTION)
+
+
+def _oid(owner_id):
+    return ObjectId(owner_id) if isinstance(owner_id, str) else owner_id
+
+
+def _counters(job: Dict) -> Counter:
+    """The counters one job contributes to its owner's stats."""
+    counters = Counter({
+        "total": 1,
+        "applied": 1 if job.get("applied") else 0,
+        f"by_company.{escape_key(job.get('company'))}": 1,
+        f"by_source.{escape_key(job.get('source'))}": 1,
+    })
+    week = week_key(job.get("date_added"))
+    if week:
+        counters[f"by_week.{week}"] = 1
+    return counters
+
+
+def stats_delta(added: Iterable[Dict] = (), removed: Iterable[Dict] = ()) -> Dict[str, int]:
+    """
+    $inc document for jobs entering and leaving a user's set. An update is
+    the old version removed plus the new one added, so unchanged counters
+    cancel out and only the fields that moved are written.
+    """
+    delta = Counter()
+    for job in added:
+        delta.update(_counters(job))
+    for job in removed:
+        delta.subtract(_counters(job))
+    return {key: n for key, n in delta.items() if n}
+
+
+async def apply_stats_delta(owner_id, added: Iterable[Dict] = (), removed: Iterable[Dict] = ()):
+    """
+    Fold job writes into the owner's stats document with one $inc. Callers
+    apply this after the job write, so a user without a stats document yet
+    is rebuilt from their jobs instead of starting from this delta alone.
+    """
+    delta = stats_delta(added, removed)
+    if not delta:
+        return
+    result = await _collection().update_one(
+        {"_id": _oid(owner_id)},
+        {"$inc": delta, "$set": {"updated_at": datetime.now(timezone.utc)}},
+    )
+    if result.matched_count == 0:
+        await rebuild_stats(owner_id)
+
+
+async def get_stats(owner_id) -> Dict:
+    """
+    The owner's stats with keys unescaped and emptied counters dropped.
+    Users whose jobs predate the stats collection are rebuilt on first read.
+    """
+    doc = await _collection().find_one({"_id": _oid(owner_id)})
+    if doc is None:
+        doc = await rebuild_stats(owner_id)
+    total = doc.get("total", 0)
+    applied = doc.get("applied", 0)
+
+    def counts(name):
+        items = ((unescape_key(k), n) for k, n in doc.get(name, {}).items() if n > 0)
+        return dict(sorted(items, key=lambda item: -item[1]))
+
+    return {
+        "total": total,
+        "applied": applied,
+        "not_applied": total - applied,
+        "by_company": counts("by_company"),
+        "by_source": counts("by_source"),
+        "by_week": dict(sorted((k, n) for k, n in doc.get("by_week", {}).items() if n > 0)),
+        "updated_at": doc.get("updated_at"),
+    }
+
+
+def _group_by(expression) -> list:
+    return [{"$group": {"_id": expression, "n": {"$sum": 1}}}]
+
+
+async def rebuild_stats(owner_id) -> Dict:
+    """
+    Recompute a user's stats from their jobs with one aggregation and
+    replace the stored document. Repairs drift from failed or racing writes.
+    """
+    owner_id = _oid(owner_id)
+    job_collection = require_collections()[1]
+    pipeline = [
+        {"$match": {"owner_id": owner_id}},
+        {"$facet": {
+            "total": [{"$count": "n"}],
+            "applied": [{"$match": {"applied": True}}, {"$count": "n"}],
+            "by_company": _group_by("$company"),
+            "by_source": _group_by("$source"),
+            "by_week": [
+                {"$match": {"date_added": {"$type": "date"}}},
+                *_group_by({"$dateToString": {"format": "%G-W%V", "date": "$date_added"}}),
+            ],
+        }},
+    ]
+    facet = (await (await job_collection.aggregate(pipeline)).to_list())[0]
+    doc = {
+        "_id": owner_id,
+        "total": facet["total"][0]["n"] if facet["total"] else 0,
+        "applied": facet["applied"][0]["n"] if facet["applied"] else 0,
+        "by_company": {escape_key(g["_id"]): g["n"] for g in facet["by_company"]},
+        "by_source": {escape_key(g["_id"]): g["n"] for g in facet["by_source"]},
+        "by_week": {g["_id"]: g["n"] for g in facet["by_week"]},
+        "updated_at": datetime.now(timezone.utc),
+    }
+    await _collection().replace_one({"_id": owner_id}, doc, upsert=True)
+    return doc
+
+
+async def rebuild_all_stats() -> int:
+    """Rebuild the stats of every user who owns jobs; returns the number of users."""
+    job_collection = require_collections()[1]
+    owners = await job_collection.distinct("owner_id")
+    for owner_id in owners:
+        await rebuild_stats(owner_id)
+    return len(owners)
+
+
+async def _main(owner_ids):
+    await connect_db(wait=True)
+    try:
+        if owner_ids:
+            for owner_id in owner_ids:
+                await rebuild_stats(owner_id)
+            print(f"Rebuilt stats for {len(owner_ids)} users")
+        else:
+            print(f"Rebuilt stats for {await rebuild_all_stats()} users")
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    # python stats.py [owner_id ...] -- repair materialized job stats
+    asyncio.run(_main(sys.argv[1:]))
@@ -1,7 +1,15 @@
-from fastapi import APIRouter, HTTPException, Request
+import asyncio
+import hmac
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional
+
+from fastapi import APIRouter, Header, HTTPException
 from pydantic import BaseModel
-from db import user_collection
+from config import settings
+from db import require_collections
 from bson import ObjectId
+from utils.telegram import enqueue_message
+from auth import invalidate_user
 import logging
 
 router = APIRouter()
@@ -13,62 +21,192 @@ class TelegramUpdate(BaseModel):
     message: dict = None
 
 
-@router.post("/webhook")
-async def telegram_webhook(update: dict):
+class _RecentIds:
+    """Bounded set of the most recently seen ids."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._ids: OrderedDict = OrderedDict()
+
+    def add(self, key) -> bool:
+        """Remember `key`; False if it was already seen."""
+        if key in self._ids:
+            self._ids.move_to_end(key)
+            return False
+        self._ids[key] = None
+        if len(self._ids) > self.size:
+            self._ids.popitem(last=False)
+        return True
+
+    def discard(self, key):
+        self._ids.pop(key, None)
+
+
+class UpdateProcessor:
+    """
+    In-process work queue for webhook updates.
+
+    The webhook only checks the update, drops repeats of a recent update_id
+    and queues it, so Telegram gets its 200 without waiting on MongoDB or
+    outgoing messages; a few worker tasks handle queued updates.
+    """
+
+    def __init__(
+        self,
+        handler: Optional[Callable[[Dict], Awaitable[None]]] = None,
+        queue_size: Optional[int] = None,
+        workers: Optional[int] = None,
+        dedup_size: Optional[int] = None,
+    ):
+        """Arguments left as None come from settings.webhook_*."""
+        self.handler = handler or handle_update
+        self.queue_size = settings.webhook_queue_size if queue_size is None else queue_size
+        self.workers = settings.webhook_workers if workers is None else workers
+        self._seen = _RecentIds(settings.webhook_dedup_size if dedup_size is None else dedup_size)
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks = []
+        self.metrics = {
+            "received": 0,
+            "duplicates": 0,
+            "rejected": 0,
+            "processed": 0,
+            "failed": 0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self):
+        if self.running:
+            return
+        if not settings.telegram_webhook_secret:
+            logger.warning("TELEGRAM_WEBHOOK_SECRET not set; webhook requests are not authenticated")
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self, drain_timeout: float = 5.0):
+        if not self.running:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Webhook queue not drained on shutdown (%d pending)", self._queue.qsize())
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def submit(self, update: Dict) -> bool:
+        """
+        Queue an update unless it is a duplicate. Returns False only when the
+        queue is full (or not running), in which case the update is forgotten
+        so Telegram's redelivery is processed.
+        """
+        self.metrics["received"] += 1
+        update_id = update["update_id"]
+        if not self._seen.add(update_id):
+            self.metrics["duplicates"] += 1
+            return True
+        try:
+            if not self.running:
+                raise asyncio.QueueFull
+            self._queue.put_nowait(update)
+        except asyncio.QueueFull:
+            self._seen.discard(update_id)
+            self.metrics["rejected"] += 1
+            return False
+        return True
+
+    async def _worker(self):
+        while True:
+            update = await self._queue.get()
+            try:
+                await self.handler(update)
+                self.metrics["processed"] += 1
+            except Exception:
+                self.metrics["failed"] += 1
+                logger.exception("Error processing Telegram update %s", update.get("update_id"))
+            finally:
+                self._queue.task_done()
+
+
+async def handle_update(update: Dict):
     """
-    Handle incoming Telegram webhook updates.
-    When a user sends /start <token> to the bot, extract their chat_id and link it to their account.
+    When a user sends /start <token> to the bot, extract their chat_id and
+    link it to their account.
     """
-    try:
-        logger.info(f"Received Telegram update: {update}")
-        
-        if "message" not in update:
-            return {"ok": True}
-        
-        message = update["message"]
-        chat_id = str(message["chat"]["id"])
-        text = message.get("text", "")
-        
-        # Handle /start command with token
-        if text.startswith("/start "):
-            token = text.split(" ", 1)[1] if len(text.split(" ")) > 1 else None
-            
-            if token:
-                # Find user by the token (we'll store temporary tokens in user document)
-                user = user_collection.find_one({"telegram_token": token})
-                
-                if user:
-                    # Update user with chat_id
-                    user_collection.update_one(
-                        {"_id": user["_id"]},
-                        {
-                            "$set": {"telegram_chat_id": chat_id},
-                            "$unset": {"telegram_token": ""}
-                        }
-                    )
-                    
-                    # Send confirmation message
-                    from utils.telegram import send_message_sync
-                    send_message_sync(
-                        chat_id,
-                        f"✅ Successfully linked to your AutoTracker account!\n\nYou will now receive job notifications here."
-                    )
-                    logger.info(f"Linked Telegram chat_id {chat_id} to user {user.get('username')}")
-                else:
-                    from utils.telegram import send_message_sync
-                    send_message_sync(
-                        chat_id,
-                        "❌ Invalid or expired link. Please generate a new link from the Settings page."
-                    )
+    logger.debug("Processing Telegram update: %s", update)
+
+    message = update.get("message")
+    if not message:
+        return
+
+    chat_id = str(message["chat"]["id"])
+    text = message.get("text", "")
+
+    # Handle /start command with token
+    if text.startswith("/start "):
+        token = text.split(" ", 1)[1] if len(text.split(" ")) > 1 else None
+
+        if token:
+            # Find user by the token (we'll store temporary tokens in user document)
+            user_collection = require_collections()[0]
+            user = await user_collection.find_one({"telegram_token": token})
+
+            if user:
+                # Update user with chat_id
+                await user_collection.update_one(
+                    {"_id": user["_id"]},
+                    {
+                        "$set": {"telegram_chat_id": chat_id},
+                        "$unset": {"telegram_token": ""}
+                    }
+                )
+                invalidate_user(user.get("username"))
+
+                # Send confirmation message
+                enqueue_message(
+                    chat_id,
+                    f"✅ Successfully linked to your AutoTracker account!\n\nYou will now receive job notifications here."
+                )
+                logger.info(f"Linked Telegram chat_id {chat_id} to user {user.get('username')}")
             else:
-                from utils.telegram import send_message_sync
-                send_message_sync(
+                enqueue_message(
                     chat_id,
-                    "👋 Welcome to AutoTracker Bot!\n\nTo link your account, please use the link from your Settings page."
+                    "❌ Invalid or expired link. Please generate a new link from the Settings page."
                 )
-        
-        return {"ok": True}
-    
-    except Exception as e:
-        logger.exception(f"Error processing Telegram webhook: {e}")
-        return {"ok": True}  # Always return success to Telegram
+        else:
+            enqueue_message(
+                chat_id,
+                "👋 Welcome to AutoTracker Bot!\n\nTo link your account, please use the link from your Settings page."
+            )
+
+
+update_processor = UpdateProcessor()
+
+
+@router.post("/webhook")
+async def telegram_webhook(
+    update: TelegramUpdate,
+    x_telegram_bot_api_secret_token: Optional[str] = Header(None),
+):
+    """
+    Receive Telegram webhook updates. Requests are authenticated with the
+    secret-token header, then queued and acknowledged immediately.
+    """
+    # Compare bytes: compare_digest rejects non-ASCII str, and headers arrive latin-1 decoded
+    secret = settings.telegram_webhook_secret
+    if secret and not hmac.compare_digest(
+        (x_telegram_bot_api_secret_token or "").encode("latin-1"),
+        secret.encode("utf-8"),
+    ):
+        raise HTTPException(status_code=401, detail="Invalid secret token")
+
+    if not update_processor.submit(update.model_dump(exclude_none=True)):
+        # Non-2xx makes Telegram redeliver later instead of losing the update
+        raise HTTPException(status_code=503, detail="Update queue full")
+    return {"ok": True}
@@ -0,0 +1,45 @@
+import asyncio
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundLoop:
+    """
+    Base for a single long-running task started and stopped by the app's
+    lifespan. Subclasses implement run(), looping until `_stop` is set and
+    pausing with `await self._sleep(delay)`.
+    """
+
+    name = "Background loop"
+
+    def __init__(self):
+        self._stop = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def run(self):
+        raise NotImplementedError
+
+    async def _sleep(self, delay: float):
+        """Wait `delay` seconds, returning early once stop() is called."""
+        try:
+            await asyncio.wait_for(self._stop.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+
+    def start(self):
+        if self._task is None:
+            self._stop.clear()
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self, timeout: float = 10.0):
+        if self._task is None:
+            return
+        self._stop.set()
+        try:
+            await asyncio.wait_for(self._task, timeout=timeout)
+        except asyncio.TimeoutError:
+            # wait_for cancels the task when it times out
+            logger.warning("%s did not stop within %.0fs; cancelled", self.name, timeout)
+        self._task = None
@@ -0,0 +1,61 @@
+import json
+import logging
+import random
+from datetime import datetime, timezone
+from typing import Optional
+
+from config import settings
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": record.getMessage(),
+            **getattr(record, "fields", {}),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            line += " " + " ".join(f"{k}={v}" for k, v in fields.items())
+        return line
+
+
+def configure_logging(level: Optional[str] = None, fmt: Optional[str] = None):
+    level = level or settings.log_level
+    fmt = fmt or settings.log_format
+    handler = logging.StreamHandler()
+    if fmt == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(TextFormatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(level)
+
+
+def log_event(logger: logging.Logger, level: int, event: str, sample: float = 1.0, **fields):
+    """
+    Log `event` with structured `fields`. Returns before doing any work when
+    `level` is disabled, and keeps only a `sample` fraction of the rest.
+    """
+    if not logger.isEnabledFor(level):
+        return
+    if sample < 1.0 and random.random() >= sample:
+        return
+    logger.log(level, event, extra={"fields": fields})
+
+
+def debug_event(logger: logging.Logger, event: str, **fields):
+    """Per-request debug event, sampled at settings.log_debug_sample_rate."""
+    if logger.isEnabledFor(logging.DEBUG):
+        log_event(logger, logging.DEBUG, event, settings.log_debug_sample_rate, **fields)
@@ -0,0 +1,49 @@
+import base64
+from typing import List, Optional
+
+from bson import json_util
+from fastapi import HTTPException
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(values: List) -> str:
+    """Encode the sort-key values of the last row into an opaque cursor."""
+    raw = json_util.dumps(values).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List:
+    """Decode a cursor produced by encode_cursor, or raise 400."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json_util.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def keyset_after(fields: List[str], values: List, descending: bool = True) -> dict:
+    """
+    Build the filter that selects rows strictly after `values` in a sort
+    over `fields` (all in the same direction), e.g. for (date_added, _id):
+    date_added < d OR (date_added == d AND _id < id).
+    """
+    op = "$lt" if descending else "$gt"
+    clauses = []
+    for i, field in enumerate(fields):
+        clause = {f: v for f, v in zip(fields[:i], values[:i])}
+        clause[field] = {op: values[i]}
+        clauses.append(clause)
+    return {"$or": clauses}
+
+
+def next_cursor(rows: List[dict], limit: int, fields: List[str]) -> Optional[str]:
+    """Return the cursor for the next page if more than `limit` rows were fetched."""
+    if len(rows) <= limit:
+        return None
+    last = rows[limit - 1]
+    return encode_cursor([last.get(f) for f in fields])
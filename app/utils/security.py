@@ -1,21 +1,88 @@
 from passlib.context import CryptContext
 from jose import jwt, JWTError
 from datetime import datetime, timedelta
-from dotenv import load_dotenv
-import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional, Tuple
+import asyncio
 
-load_dotenv()
-SECRET_KEY=os.getenv("SECRET_KEY")
-ALGORITHM=os.getenv("ALGORITHM")
-ACCESS_TOKEN_EXPIRE_MINUTES=int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES"))
+from config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Rebuilt only if settings.bcrypt_rounds changes
+@lru_cache(maxsize=None)
+def _crypt_context(rounds: int) -> CryptContext:
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+
+def _pwd_context() -> CryptContext:
+    return _crypt_context(settings.bcrypt_rounds)
 
 def hash_password(password:str) -> str:
-    return pwd_context.hash(password)
+    return _pwd_context().hash(password)
 
 def verify_password(plain_password:str, hashed_password:str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return _pwd_context().verify(plain_password, hashed_password)
+
+def needs_rehash(hashed_password:str) -> bool:
+    """True when a stored hash uses another scheme or bcrypt cost than configured."""
+    if _pwd_context().needs_update(hashed_password):
+        return True
+    try:
+        return int(hashed_password.split("$")[2]) != settings.bcrypt_rounds
+    except (IndexError, ValueError):
+        return True
+
+def verify_and_rehash(plain_password:str, hashed_password:str) -> Tuple[bool, Optional[str]]:
+    """Verify a password and return a fresh hash too if the stored one is outdated."""
+    if not _pwd_context().verify(plain_password, hashed_password):
+        return False, None
+    if needs_rehash(hashed_password):
+        return True, _pwd_context().hash(plain_password)
+    return True, None
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many hash/verify calls are already queued."""
+
+
+_executor: Optional[Executor] = None
+_pending = 0
+
+def _get_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        if settings.password_hash_executor == "thread":
+            _executor = ThreadPoolExecutor(max_workers=settings.password_hash_workers, thread_name_prefix="bcrypt")
+        else:
+            _executor = ProcessPoolExecutor(max_workers=settings.password_hash_workers)
+    return _executor
+
+async def _run_limited(func, *args):
+    global _pending
+    if _pending >= settings.password_hash_max_pending:
+        raise PasswordHasherBusy()
+    _pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), func, *args)
+    finally:
+        _pending -= 1
+
+async def hash_password_async(password:str) -> str:
+    """Hash on the dedicated bcrypt pool. Raises PasswordHasherBusy when saturated."""
+    return await _run_limited(hash_password, password)
+
+async def verify_password_async(plain_password:str, hashed_password:str) -> Tuple[bool, Optional[str]]:
+    """verify_and_rehash() on the dedicated bcrypt pool. Raises PasswordHasherBusy when saturated."""
+    return await _run_limited(verify_and_rehash, plain_password, hashed_password)
+
+def password_pool_stats() -> dict:
+    return {"pending": _pending, "max_pending": settings.password_hash_max_pending, "workers": settings.password_hash_workers}
+
+def shutdown_password_pool():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
 
 def create_access_token(data: dict, secret_key: str, algorithm: str, expirey_minutes: int)->str:
     to_encode=data.copy()
@@ -24,4 +91,4 @@ def create_access_token(data: dict, secret_key: str, algorithm: str, expirey_min
     return jwt.encode(to_encode,secret_key, algorithm=algorithm)
 
 def decode_access_token(token:str)-> dict:
-        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        return jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
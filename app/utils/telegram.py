@@ -1,36 +1,308 @@
 import asyncio
-from telegram.ext import ApplicationBuilder
-from dotenv import load_dotenv
-import os
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
 
-load_dotenv()
-TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
+from telegram import Bot
+from telegram.error import BadRequest, NetworkError, RetryAfter, TelegramError
+from telegram.request import HTTPXRequest
 
-async def send_telegram_message(chat_id: str, message: str):
-    try:
-        if not TELEGRAM_BOT_TOKEN:
-            print("ERROR: TELEGRAM_BOT_TOKEN not set; skipping Telegram send")
+from config import settings
+from metrics import telegram_send_duration
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize_chat_id(chat_id):
+    # Cast to int if numeric (Telegram user chat ids are integers)
+    if isinstance(chat_id, str) and chat_id.lstrip("-").isdigit():
+        return int(chat_id)
+    return chat_id
+
+
+@dataclass
+class _OutboundMessage:
+    chat_id: object
+    text: str
+    attempts: int = 0
+    reserved: bool = False
+    future: Optional[asyncio.Future] = None
+
+
+class _TokenBucket:
+    """Global send rate limiter shared by all workers."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class _ChatLimiter:
+    """Hands out per-chat send slots so one chat never exceeds Telegram's limit."""
+
+    def __init__(self, private_interval: float, group_interval: float, max_chats: int = 10000):
+        self.private_interval = private_interval
+        self.group_interval = group_interval
+        self.max_chats = max_chats
+        self._next_slot: Dict[object, float] = {}
+
+    def reserve(self, chat_id) -> float:
+        """Reserve the next slot for chat_id and return how long to wait for it."""
+        now = time.monotonic()
+        if len(self._next_slot) > self.max_chats:
+            self._next_slot = {c: t for c, t in self._next_slot.items() if t > now}
+        is_group = isinstance(chat_id, int) and chat_id < 0
+        interval = self.group_interval if is_group else self.private_interval
+        slot = max(now, self._next_slot.get(chat_id, 0.0))
+        self._next_slot[chat_id] = slot + interval
+        return slot - now
+
+
+class TelegramNotifier:
+    """
+    Long-lived outbound Telegram queue.
+
+    One Bot (and its pooled HTTP client) is created at startup; callers only
+    enqueue messages and return immediately while a few worker tasks drain
+    the queue under global and per-chat rate limits, retrying 429/5xx with
+    backoff.
+    """
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        base_url: Optional[str] = None,
+        queue_size: Optional[int] = None,
+        workers: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        global_rate: Optional[float] = None,
+        chat_interval: Optional[float] = None,
+        group_interval: Optional[float] = None,
+    ):
+        """Arguments left as None come from settings.telegram_*."""
+        self.token = token or settings.telegram_bot_token
+        self.base_url = base_url or settings.telegram_api_base_url
+        self.queue_size = settings.telegram_queue_size if queue_size is None else queue_size
+        self.workers = settings.telegram_workers if workers is None else workers
+        self.max_retries = settings.telegram_max_retries if max_retries is None else max_retries
+        self.global_rate = settings.telegram_global_rate if global_rate is None else global_rate
+        self.chat_interval = settings.telegram_chat_interval if chat_interval is None else chat_interval
+        self.group_interval = settings.telegram_group_interval if group_interval is None else group_interval
+
+        self.bot: Optional[Bot] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks = []
+        self._bucket: Optional[_TokenBucket] = None
+        self._chats: Optional[_ChatLimiter] = None
+        # Messages accepted but not yet sent or failed, including parked ones
+        self._pending = 0
+        self._idle: Optional[asyncio.Event] = None
+        self.metrics = {
+            "enqueued": 0,
+            "sent": 0,
+            "failed": 0,
+            "retried": 0,
+            "dropped": 0,
+            "max_depth": 0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self):
+        if self.running:
+            return
+        if not self.token:
+            logger.warning("TELEGRAM_BOT_TOKEN not set; Telegram notifications disabled")
             return
-        
-        print(f"Attempting to send Telegram message to chat_id: {chat_id}")
-        application = ApplicationBuilder().token(TELEGRAM_BOT_TOKEN).build()
-        
-        # Cast to int if numeric (Telegram user chat ids are integers)
-        chat = int(chat_id) if isinstance(chat_id, str) and chat_id.lstrip('-').isdigit() else chat_id
-        print(f"Sending message to chat: {chat} (type: {type(chat)})")
-        
-        await application.bot.send_message(chat_id=chat, text=message)
-        print(f"✓ Message sent successfully to {chat}")
-        await application.shutdown()
-    except Exception as e:
-        print(f"ERROR sending message to {chat_id}: {type(e).__name__}: {e}")
-        # Do not re-raise; notification failures should not break business logic
-        return
-
-def send_message_sync(chat_id: str, message: str):
-    try:
-        asyncio.run(send_telegram_message(chat_id, message))
-    except Exception as e:
-        # Protect callers from asyncio event loop issues
-        print(f"send_message_sync error for {chat_id}: {e}")
-        return
\ No newline at end of file
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._bucket = _TokenBucket(self.global_rate)
+        self._chats = _ChatLimiter(self.chat_interval, self.group_interval)
+        self._idle = asyncio.Event()
+        self._idle.set()
+        request = HTTPXRequest(connection_pool_size=self.workers + 1)
+        self.bot = Bot(token=self.token, base_url=self.base_url, request=request)
+        # Initialized in the background so an unreachable Telegram can't hold up startup
+        self._tasks = [asyncio.create_task(self._initialize())]
+        self._tasks += [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        logger.info("Telegram notifier started with %d workers", self.workers)
+
+    async def _initialize(self):
+        try:
+            # Validates the token and warms up the connection pool
+            await self.bot.initialize()
+        except TelegramError as e:
+            logger.warning("Telegram bot initialization failed: %s", e)
+
+    async def stop(self, drain_timeout: float = 5.0):
+        if not self.running:
+            return
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Telegram queue not drained on shutdown (%d pending)", self._pending)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        try:
+            await self.bot.shutdown()
+        except TelegramError:
+            pass
+        self.bot = None
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def enqueue(self, chat_id, text: str) -> bool:
+        """
+        Queue a message for background delivery. Safe to call from the event
+        loop or from threadpool handlers. Returns False if it was dropped.
+        """
+        if not self.running:
+            logger.warning("Telegram notifier not running; dropping message for %s", chat_id)
+            self.metrics["dropped"] += 1
+            return False
+        item = _OutboundMessage(chat_id=_normalize_chat_id(chat_id), text=text)
+        try:
+            in_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            in_loop = False
+        if in_loop:
+            return self._put(item)
+        self._loop.call_soon_threadsafe(self._put, item)
+        return True
+
+    async def deliver(self, chat_id, text: str):
+        """Queue a message and wait until it is sent; raises if delivery fails."""
+        if not self.running:
+            raise RuntimeError("Telegram notifier is not running")
+        item = _OutboundMessage(
+            chat_id=_normalize_chat_id(chat_id),
+            text=text,
+            future=self._loop.create_future(),
+        )
+        if not self._put(item):
+            raise RuntimeError("Telegram queue is full")
+        return await item.future
+
+    def _put(self, item: _OutboundMessage, retry: bool = False) -> bool:
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.metrics["dropped"] += 1
+            logger.warning("Telegram queue full; dropping message for %s", item.chat_id)
+            if item.future is not None and not item.future.done():
+                item.future.set_exception(RuntimeError("Telegram queue is full"))
+            if retry:
+                self._done()
+            return False
+        if not retry:
+            self.metrics["enqueued"] += 1
+            self._pending += 1
+            self._idle.clear()
+        self.metrics["max_depth"] = max(self.metrics["max_depth"], self._queue.qsize())
+        return True
+
+    def _done(self):
+        self._pending -= 1
+        if self._pending <= 0:
+            self._pending = 0
+            self._idle.set()
+
+    def _requeue_later(self, item: _OutboundMessage, delay: float):
+        self._loop.call_later(delay, self._put, item, True)
+
+    async def _worker(self):
+        while True:
+            item = await self._queue.get()
+            try:
+                if not item.reserved:
+                    # Park messages for a busy chat instead of stalling the worker
+                    item.reserved = True
+                    wait = self._chats.reserve(item.chat_id)
+                    if wait > 0:
+                        self._requeue_later(item, wait)
+                        continue
+                await self._bucket.acquire()
+                await self._send(item)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Unexpected error in Telegram worker")
+            finally:
+                self._queue.task_done()
+
+    async def _send(self, item: _OutboundMessage):
+        started = time.perf_counter()
+        try:
+            result = await self.bot.send_message(chat_id=item.chat_id, text=item.text)
+        except RetryAfter as e:
+            telegram_send_duration.observe(time.perf_counter() - started, "throttled")
+            self._retry(item, float(e.retry_after), e)
+        except BadRequest as e:
+            telegram_send_duration.observe(time.perf_counter() - started, "rejected")
+            self._fail(item, e)
+        except NetworkError as e:
+            telegram_send_duration.observe(time.perf_counter() - started, "network_error")
+            # Timeouts, connection errors and 5xx responses
+            backoff = min(60.0, 2 ** item.attempts) + random.uniform(0, 1)
+            self._retry(item, backoff, e)
+        except TelegramError as e:
+            telegram_send_duration.observe(time.perf_counter() - started, "error")
+            self._fail(item, e)
+        else:
+            telegram_send_duration.observe(time.perf_counter() - started, "sent")
+            self.metrics["sent"] += 1
+            self._done()
+            if item.future is not None and not item.future.done():
+                item.future.set_result(result)
+
+    def _retry(self, item: _OutboundMessage, delay: float, error: Exception):
+        item.attempts += 1
+        if item.attempts > self.max_retries:
+            self._fail(item, error)
+            return
+        self.metrics["retried"] += 1
+        logger.info("Retrying Telegram send to %s in %.1fs: %s", item.chat_id, delay, error)
+        item.reserved = False
+        self._requeue_later(item, delay)
+
+    def _fail(self, item: _OutboundMessage, error: Exception):
+        self.metrics["failed"] += 1
+        self._done()
+        logger.error("Failed to send Telegram message to %s: %s: %s", item.chat_id, type(error).__name__, error)
+        if item.future is not None and not item.future.done():
+            item.future.set_exception(error)
+
+
+notifier = TelegramNotifier()
+
+
+def enqueue_message(chat_id: str, message: str) -> bool:
+    """Queue a Telegram message without waiting for delivery."""
+    return notifier.enqueue(chat_id, message)
+
+
+async def send_telegram_message(chat_id: str, message: str):
+    """Send a Telegram message through the queue and wait for the result."""
+    return await notifier.deliver(chat_id, message)
@@ -0,0 +1,73 @@
+import hashlib
+from typing import Optional
+
+from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+from db import require_database
+
+# One document per user: {"_id": owner_id, "v": <int>}, bumped by every job write
+VERSION_COLLECTION = "job_versions"
+
+
+def _collection():
+    return require_database().get_collection(VERSION_COLLECTION)
+
+
+def _oid(owner_id):
+    return ObjectId(owner_id) if isinstance(owner_id, str) else owner_id
+
+
+async def get_version(owner_id) -> int:
+    doc = await _collection().find_one({"_id": _oid(owner_id)})
+    return doc["v"] if doc else 0
+
+
+async def bump_version(owner_id, expected: Optional[int] = None) -> Optional[int]:
+    """
+    Atomically increment the user's jobs version and return the new value.
+    With `expected`, only bump if the current version equals it; returns
+    None when another write got there first.
+    """
+    query = {"_id": _oid(owner_id)}
+    if expected is not None:
+        # A user who never wrote has no document yet, i.e. version 0
+        query["v"] = expected if expected else {"$in": [0, None]}
+    try:
+        doc = await _collection().find_one_and_update(
+            query, {"$inc": {"v": 1}}, upsert=True, return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        # Upsert raced with an existing document that didn't match `expected`
+        return None
+    return doc["v"]
+
+
+async def bump_versions(owner_ids) -> None:
+    """Increment several users' jobs versions with one bulk_write."""
+    # Convert before deduping so an id given as str and ObjectId bumps once
+    owners = {_oid(owner_id) for owner_id in owner_ids}
+    ops = [UpdateOne({"_id": owner_id}, {"$inc": {"v": 1}}, upsert=True) for owner_id in owners]
+    if ops:
+        await _collection().bulk_write(ops, ordered=False)
+
+
+def make_etag(owner_id, version: int, *parts) -> str:
+    """Strong ETag for a representation of the user's jobs at `version`."""
+    key = ":".join([str(owner_id), str(version), *(str(p) for p in parts)])
+    digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+    return f'"v{version}.{digest}"'
+
+
+def etag_matches(header: Optional[str], etag: str, weak: bool = True) -> bool:
+    """
+    True if an If-None-Match (weak comparison) or If-Match (weak=False)
+    header lists `etag` or is "*".
+    """
+    if not header:
+        return False
+    candidates = [c.strip() for c in header.split(",")]
+    if weak:
+        candidates = [c.removeprefix("W/") for c in candidates]
+    return "*" in candidates or etag in candidates
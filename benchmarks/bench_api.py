@@ -0,0 +1,419 @@
+"""
+End-to-end API load test: the real app under uvicorn, offline.
+
+    python benchmarks/bench_api.py --mongo-uri mongodb://127.0.0.1:27017 --duration 30
+    python benchmarks/bench_api.py --mongod /usr/bin/mongod --output run.json --compare baseline.json
+
+Seeds a throwaway database (1k users / 100k jobs by default), starts
+main:app with uvicorn in a subprocess pointed at that database and at the
+fake Bot API in fake_telegram.py, then drives a weighted mix of login,
+job CRUD, list/search/stats and webhook requests from concurrent clients.
+
+Prints (or writes) JSON with per-scenario latency histograms and
+percentiles. --compare exits non-zero if any scenario's p99 regressed by
+more than --threshold against an earlier run. With --mongod a temporary
+mongod is started on --mongo-port and removed afterwards; otherwise the
+database named --db-name on --mongo-uri is dropped and reseeded.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app")
+sys.path.insert(0, APP_DIR)
+
+SECRET_KEY = "bench-secret-key"
+WEBHOOK_SECRET = "bench-webhook-secret"
+PASSWORD = "bench-password"
+# Upper bounds in milliseconds; the last bucket is open-ended
+BUCKETS_MS = [0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000]
+
+DEFAULT_MIX = {
+    "list_jobs": 35,
+    "list_summary": 10,
+    "get_job": 15,
+    "create_job": 8,
+    "update_job": 8,
+    "delete_job": 3,
+    "search": 6,
+    "stats": 5,
+    "webhook": 8,
+    "login": 2,
+}
+SKILLS = ["python", "go", "rust", "react", "aws", "kubernetes", "django", "fastapi", "java", "sql"]
+COMPANIES = [f"Company {i}" for i in range(400)]
+WORDS = "build ship maintain scale design review deploy services data platform team remote".split()
+
+
+# ---------- seeding ----------
+
+def _description(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS + SKILLS) for _ in range(rng.randint(40, 120)))
+
+
+def seed(mongo_uri: str, db_name: str, users: int, jobs: int, rng: random.Random):
+    """Reset the database and insert users and jobs; returns (usernames, {username: [job ids]})."""
+    from bson import ObjectId
+    from pymongo import MongoClient
+    from utils.security import hash_password
+
+    client = MongoClient(mongo_uri)
+    client.drop_database(db_name)
+    db = client[db_name]
+    # Every user shares one password, so bcrypt runs once here
+    hashed = hash_password(PASSWORD)
+    user_docs = [
+        {
+            "_id": ObjectId(),
+            "username": f"bench{i}",
+            "email": f"bench{i}@example.com",
+            "password": hashed,
+            "telegram_chat_id": str(100000 + i) if rng.random() < 0.8 else "",
+            "skills": rng.sample(SKILLS, 3),
+        }
+        for i in range(users)
+    ]
+    db.users.insert_many(user_docs)
+
+    now = datetime.now(timezone.utc)
+    job_ids = defaultdict(list)
+    batch = []
+    for n in range(jobs):
+        user = user_docs[n % users]
+        doc = {
+            "_id": ObjectId(),
+            "owner_id": user["_id"],
+            "title": f"{rng.choice(SKILLS).title()} Engineer",
+            "company": rng.choice(COMPANIES),
+            "location": rng.choice([None, "Remote", "Berlin", "London", "New York"]),
+            "description": _description(rng),
+            "link": f"https://jobs.example/{n}",
+            "applied": rng.random() < 0.2,
+            "date_added": now - timedelta(minutes=rng.randint(0, 180 * 24 * 60)),
+            "source": rng.choice(["remotive", "remoteok", None]),
+            "skills_matched": rng.sample(SKILLS, 2),
+            "change_history": [],
+        }
+        job_ids[user["username"]].append(doc["_id"])
+        batch.append(doc)
+        if len(batch) == 5000:
+            db.jobs.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        db.jobs.insert_many(batch, ordered=False)
+    client.close()
+    return [u["username"] for u in user_docs], job_ids
+
+
+# ---------- processes ----------
+
+def start_mongod(binary: str, port: int):
+    dbpath = tempfile.mkdtemp(prefix="bench-mongod-")
+    process = subprocess.Popen(
+        [binary, "--dbpath", dbpath, "--port", str(port), "--bind_ip", "127.0.0.1", "--quiet"],
+        stdout=subprocess.DEVNULL,
+    )
+    return process, dbpath
+
+
+def wait_for(url: str, timeout: float):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise SystemExit(f"{url} did not come up within {timeout:.0f}s")
+
+
+def start_app(args, telegram_url: str):
+    env = {
+        **os.environ,
+        "MONGO_URI": args.mongo_uri,
+        "DB_NAME": args.db_name,
+        "SECRET_KEY": SECRET_KEY,
+        "ALGORITHM": "HS256",
+        "ACCESS_TOKEN_EXPIRE_MINUTES": "120",
+        "BCRYPT_ROUNDS": str(args.bcrypt_rounds),
+        "TELEGRAM_BOT_TOKEN": "123456:bench",
+        "TELEGRAM_API_BASE_URL": f"{telegram_url}/bot",
+        "TELEGRAM_WEBHOOK_SECRET": WEBHOOK_SECRET,
+        "NOTIFY_COALESCE_WINDOW": str(args.coalesce_window),
+        "SCRAPER_ENABLED": "false",
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1",
+         "--port", str(args.port), "--log-level", "warning"],
+        cwd=APP_DIR, env=env,
+    )
+
+
+# ---------- load ----------
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+
+    def record(self, scenario: str, seconds: float, status: int):
+        self.latencies[scenario].append(seconds * 1000)
+        self.statuses[scenario][status] += 1
+
+    def report(self, elapsed: float) -> dict:
+        scenarios = {}
+        for scenario, values in sorted(self.latencies.items()):
+            ordered = sorted(values)
+
+            def pct(p):
+                return round(ordered[min(len(ordered) - 1, int(len(ordered) * p))], 2)
+
+            histogram, start = [], 0
+            for bound in BUCKETS_MS + [float("inf")]:
+                end = start
+                while end < len(ordered) and ordered[end] <= bound:
+                    end += 1
+                histogram.append(["+Inf" if bound == float("inf") else bound, end - start])
+                start = end
+            errors = sum(n for status, n in self.statuses[scenario].items() if status >= 400)
+            scenarios[scenario] = {
+                "count": len(values),
+                "errors": errors,
+                "rps": round(len(values) / elapsed, 1),
+                "mean_ms": round(sum(values) / len(values), 2),
+                "p50_ms": pct(0.50),
+                "p90_ms": pct(0.90),
+                "p99_ms": pct(0.99),
+                "max_ms": round(ordered[-1], 2),
+                "statuses": {str(s): n for s, n in sorted(self.statuses[scenario].items())},
+                "histogram_ms": histogram,
+            }
+        return scenarios
+
+
+class Workload:
+    def __init__(self, client: httpx.AsyncClient, usernames, job_ids, mix, rng: random.Random):
+        from utils.security import create_access_token
+
+        self.client = client
+        self.usernames = usernames
+        self.job_ids = job_ids
+        self.rng = rng
+        self.names = list(mix)
+        self.weights = list(mix.values())
+        # Minted directly so 1k logins don't dominate setup; login is measured separately
+        self.headers = {
+            name: {"Authorization": "Bearer " + create_access_token(
+                {"sub": name}, secret_key=SECRET_KEY, algorithm="HS256", expirey_minutes=120
+            )}
+            for name in usernames
+        }
+        self.update_id = 0
+
+    def _job(self, user):
+        ids = self.job_ids[user]
+        return str(self.rng.choice(ids)) if ids else None
+
+    def _body(self):
+        return {
+            "title": f"{self.rng.choice(SKILLS).title()} Developer",
+            "company": self.rng.choice(COMPANIES),
+            "description": _description(self.rng),
+            "link": "https://jobs.example/new",
+            "skills_matched": self.rng.sample(SKILLS, 2),
+        }
+
+    async def request(self, scenario: str):
+        user = self.rng.choice(self.usernames)
+        headers = self.headers[user]
+        c = self.client
+        if scenario == "list_jobs":
+            return await c.get("/jobs/", params={"limit": 100}, headers=headers)
+        if scenario == "list_summary":
+            return await c.get("/jobs/", params={"limit": 100, "view": "summary"}, headers=headers)
+        if scenario == "search":
+            return await c.get("/jobs/search", params={"q": self.rng.choice(SKILLS)}, headers=headers)
+        if scenario == "stats":
+            return await c.get("/jobs/stats", headers=headers)
+        if scenario == "create_job":
+            response = await c.post("/jobs/", json=self._body(), headers=headers)
+            if response.status_code == 200:
+                from bson import ObjectId
+                self.job_ids[user].append(ObjectId(response.json()["_id"]))
+            return response
+        if scenario == "login":
+            return await c.post("/auth/login", data={"username": user, "password": PASSWORD})
+        if scenario == "webhook":
+            self.update_id += 1
+            update = {"update_id": self.update_id, "message": {
+                "message_id": self.update_id, "chat": {"id": 100000 + self.update_id % 1000}, "text": "/start",
+            }}
+            return await c.post(
+                "/telegram/webhook", json=update, headers={"X-Telegram-Bot-Api-Secret-Token": WEBHOOK_SECRET}
+            )
+
+        job_id = self._job(user)
+        if job_id is None:
+            return await c.post("/jobs/", json=self._body(), headers=headers)
+        if scenario == "get_job":
+            return await c.get(f"/jobs/{job_id}", headers=headers)
+        if scenario == "update_job":
+            return await c.put(f"/jobs/{job_id}", json={**self._body(), "applied": True}, headers=headers)
+        if scenario == "delete_job":
+            self.job_ids[user] = [j for j in self.job_ids[user] if str(j) != job_id]
+            return await c.delete(f"/jobs/{job_id}", headers=headers)
+        raise ValueError(f"unknown scenario {scenario!r}")
+
+    async def run(self, recorder: Recorder, concurrency: int, seconds: float):
+        deadline = time.monotonic() + seconds
+
+        async def worker():
+            while time.monotonic() < deadline:
+                scenario = self.rng.choices(self.names, self.weights)[0]
+                started = time.perf_counter()
+                try:
+                    status = (await self.request(scenario)).status_code
+                except httpx.HTTPError:
+                    status = 599
+                if recorder is not None:
+                    recorder.record(scenario, time.perf_counter() - started, status)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+async def drive(args, usernames, job_ids) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", limits=limits, timeout=60) as client:
+        workload = Workload(client, usernames, job_ids, args.mix, random.Random(args.seed))
+        if args.warmup:
+            await workload.run(None, args.concurrency, args.warmup)
+        recorder = Recorder()
+        started = time.perf_counter()
+        await workload.run(recorder, args.concurrency, args.duration)
+        elapsed = time.perf_counter() - started
+    scenarios = recorder.report(elapsed)
+    total = sum(s["count"] for s in scenarios.values())
+    return {"elapsed_s": round(elapsed, 2), "requests": total, "rps": round(total / elapsed, 1), "scenarios": scenarios}
+
+
+def compare(report: dict, baseline_path: str, threshold: float) -> bool:
+    """Print p50/p99 changes against a previous run; False if any p99 regressed past `threshold`."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    ok = True
+    for name, current in report["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        change = (current["p99_ms"] - before["p99_ms"]) / max(before["p99_ms"], 0.01)
+        flag = "REGRESSION" if change > threshold else ""
+        ok = ok and not flag
+        print(
+            f"{name:14} p50 {before['p50_ms']:8.2f} -> {current['p50_ms']:8.2f} ms   "
+            f"p99 {before['p99_ms']:8.2f} -> {current['p99_ms']:8.2f} ms ({change:+.0%}) {flag}",
+            file=sys.stderr,
+        )
+    return ok
+
+
+def parse_mix(value: str) -> dict:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"unknown scenario {name!r}")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mongo-uri", default=os.getenv("MONGO_URI", "mongodb://127.0.0.1:27017"))
+    parser.add_argument("--mongod", help="mongod binary to start a throwaway server with")
+    parser.add_argument("--mongo-port", type=int, default=27117)
+    parser.add_argument("--db-name", default="autotrackr_bench")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--jobs", type=int, default=100000)
+    parser.add_argument("--port", type=int, default=8710)
+    parser.add_argument("--telegram-port", type=int, default=8702)
+    parser.add_argument("--telegram-latency", type=float, default=0.03)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help="e.g. list_jobs=5,get_job=2,login=1")
+    parser.add_argument("--bcrypt-rounds", type=int, default=12)
+    parser.add_argument("--coalesce-window", type=float, default=30.0)
+    parser.add_argument("--startup-timeout", type=float, default=300.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", help="earlier JSON report to compare p99s against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative p99 increase")
+    args = parser.parse_args()
+
+    os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "120")
+    os.environ.setdefault("BCRYPT_ROUNDS", str(args.bcrypt_rounds))
+    from fake_telegram import create_app as create_telegram_app
+    from fixture_server import serve_in_thread
+
+    mongod = dbpath = app = None
+    try:
+        if args.mongod:
+            args.mongo_uri = f"mongodb://127.0.0.1:{args.mongo_port}"
+            mongod, dbpath = start_mongod(args.mongod, args.mongo_port)
+
+        started = time.perf_counter()
+        usernames, job_ids = seed(args.mongo_uri, args.db_name, args.users, args.jobs, random.Random(args.seed))
+        seed_seconds = time.perf_counter() - started
+
+        telegram = create_telegram_app(latency=args.telegram_latency)
+        serve_in_thread(telegram, args.telegram_port)
+
+        started = time.perf_counter()
+        app = start_app(args, f"http://127.0.0.1:{args.telegram_port}")
+        wait_for(f"http://127.0.0.1:{args.port}/readyz", args.startup_timeout)
+        startup_seconds = time.perf_counter() - started
+
+        result = asyncio.run(drive(args, usernames, job_ids))
+        report = {
+            "config": {
+                "users": args.users, "jobs": args.jobs, "concurrency": args.concurrency,
+                "duration_s": args.duration, "mix": args.mix, "bcrypt_rounds": args.bcrypt_rounds,
+            },
+            "seed_s": round(seed_seconds, 2),
+            "startup_s": round(startup_seconds, 2),
+            **result,
+            "telegram": dict(telegram.state.stats),
+        }
+    finally:
+        if app is not None:
+            app.terminate()
+            app.wait(timeout=30)
+        if mongod is not None:
+            mongod.terminate()
+            mongod.wait(timeout=30)
+            shutil.rmtree(dbpath, ignore_errors=True)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+    if args.compare and not compare(report, args.compare, args.threshold):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Link-checker throughput and correctness against a local stand-in server.
+
+    python benchmarks/bench_linkcheck.py --links 20000 --latency 0.02
+
+The stand-in serves /jobs/<n> on two host names (127.0.0.1 and localhost)
+so per-host limits apply, and answers by n % 10: live pages, 404 and 410,
+servers that reject HEAD (405, live on GET), redirects to a live page,
+503s and, with --latency, slow responses. Prints a JSON summary with the
+sustained checks/hour and exits non-zero if any link was misclassified
+or the write-back plan doesn't flip exactly the links that changed state.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+from bson import ObjectId
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import RedirectResponse, Response
+from starlette.routing import Route
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from fixture_server import serve_in_thread  # noqa: E402
+from linkcheck import LinkChecker, plan_updates  # noqa: E402
+
+# n % 10 -> (HEAD status, GET status, expected expired flag)
+BEHAVIOUR = {
+    0: (404, 404, True),
+    1: (410, 410, True),
+    2: (405, 200, False),
+    3: (503, 503, None),
+    4: (301, 301, False),
+}
+LIVE = (200, 200, False)
+
+
+def create_app(latency: float = 0.0) -> Starlette:
+    async def job(request: Request):
+        if latency:
+            await asyncio.sleep(latency)
+        n = int(request.path_params["n"])
+        head_status, get_status, _ = BEHAVIOUR.get(n % 10, LIVE)
+        status = head_status if request.method == "HEAD" else get_status
+        if status == 301:
+            return RedirectResponse("/jobs/live", status_code=301)
+        return Response(b"<html>posting</html>" * 50, status_code=status, media_type="text/html")
+
+    async def live(request: Request):
+        return Response(b"ok")
+
+    return Starlette(routes=[
+        Route("/jobs/live", live, methods=["GET", "HEAD"]),
+        Route("/jobs/{n:int}", job, methods=["GET", "HEAD"]),
+    ])
+
+
+async def run(args) -> dict:
+    hosts = [f"http://127.0.0.1:{args.port}", f"http://localhost:{args.port}"]
+    links = [f"{hosts[n % 2]}/jobs/{n}" for n in range(args.links)]
+    checker = LinkChecker(
+        concurrency=args.concurrency,
+        per_host_concurrency=args.per_host_concurrency,
+        per_host_rate=args.rate,
+        timeout=args.timeout,
+    )
+    started = time.perf_counter()
+    results = []
+    for i in range(0, len(links), args.batch_size):
+        results += await checker.check_many(links[i:i + args.batch_size])
+    elapsed = time.perf_counter() - started
+    await checker.stop()
+
+    expected = [BEHAVIOUR.get(n % 10, LIVE)[2] for n in range(args.links)]
+    wrong = [links[i] for i, r in enumerate(results) if r.expired != expected[i]]
+
+    # Stored state: every third job was already marked expired, so live
+    # links among them must flip back and dead ones flip only if not marked
+    jobs = [
+        {"_id": ObjectId(), "owner_id": ObjectId(), "link": link, "expired": n % 3 == 0}
+        for n, link in enumerate(links)
+    ]
+    ops, changes = plan_updates(jobs, results, datetime.now(timezone.utc), max_failures=args.max_failures)
+    expected_flips = sum(
+        1 for job, result in zip(jobs, results)
+        if result.expired is not None and result.expired != job["expired"]
+    )
+    return {
+        "links": len(links),
+        "elapsed_s": round(elapsed, 3),
+        "checks_per_s": round(len(links) / elapsed, 1),
+        "checks_per_hour": int(len(links) / elapsed * 3600),
+        "statuses": dict(Counter(r.status for r in results)),
+        "misclassified": wrong[:10],
+        "updates": len(ops),
+        "flips": len(changes),
+        "correct": not wrong and len(ops) == len(jobs) and len(changes) == expected_flips,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8702)
+    parser.add_argument("--links", type=int, default=5000)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds added to every /jobs response")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--per-host-concurrency", type=int, default=16)
+    parser.add_argument("--rate", type=float, default=0, help="per-host requests/s (0 = unlimited)")
+    parser.add_argument("--timeout", type=float, default=5.0)
+    parser.add_argument("--max-failures", type=int, default=3)
+    args = parser.parse_args()
+    serve_in_thread(create_app(args.latency), args.port)
+    result = asyncio.run(run(args))
+    print(json.dumps(result, indent=2))
+    if not result["correct"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Skill-matcher benchmark: index build, full scan and incremental updates.
+
+    python benchmarks/bench_matcher.py --users 10000 --jobs 100000
+
+Also times the naive per-user/per-skill substring loop on a sample of jobs
+for comparison, and checks both agree on that sample.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from matcher import SkillMatcher, normalize_skill, tokenize  # noqa: E402
+
+BASE_SKILLS = [
+    "python", "java", "c++", "c#", "go", "rust", "node.js", "react", "vue", "django",
+    "fastapi", "flask", "kubernetes", "docker", "terraform", "aws", "gcp", "azure",
+    "postgresql", "mongodb", "redis", "kafka", "spark", "machine learning", "data engineering",
+    "computer vision", "typescript", "graphql", "ruby on rails", "swift", "kotlin", "scala",
+]
+FILLER = "we are hiring a team player to build ship and maintain great products for our customers".split()
+
+
+def make_vocabulary(size: int, rng: random.Random):
+    vocab = list(BASE_SKILLS)
+    while len(vocab) < size:
+        words = rng.randint(1, 3)
+        vocab.append(" ".join(f"tech{rng.randint(0, size * 2)}" for _ in range(words)))
+    return vocab
+
+
+def make_job(vocab, rng: random.Random):
+    words = [rng.choice(FILLER) for _ in range(120)]
+    for _ in range(rng.randint(2, 8)):
+        words.insert(rng.randrange(len(words)), rng.choice(vocab))
+    return {"title": f"{rng.choice(vocab)} engineer", "description": " ".join(words)}
+
+
+def naive_match(users, job):
+    tokens = " " + " ".join(tokenize(f"{job['title']}\n{job['description']}")) + " "
+    return {
+        user_id: sorted(s for s in skills if f" {normalize_skill(s)} " in tokens)
+        for user_id, skills in users.items()
+        if any(f" {normalize_skill(s)} " in tokens for s in skills)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--jobs", type=int, default=100000)
+    parser.add_argument("--vocabulary", type=int, default=3000)
+    parser.add_argument("--naive-sample", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    vocab = make_vocabulary(args.vocabulary, rng)
+    users = {f"user{i}": rng.sample(vocab, rng.randint(3, 10)) for i in range(args.users)}
+    jobs = [make_job(vocab, rng) for _ in range(args.jobs)]
+
+    matcher = SkillMatcher()
+    started = time.perf_counter()
+    for user_id, skills in users.items():
+        matcher.set_user_skills(user_id, skills)
+    build_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    pairs = 0
+    for job in jobs:
+        pairs += len(matcher.match_job(job))
+    scan_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for user_id in rng.sample(list(users), 1000):
+        matcher.set_user_skills(user_id, rng.sample(vocab, rng.randint(3, 10)))
+    update_s = time.perf_counter() - started
+
+    sample = jobs[: args.naive_sample]
+    started = time.perf_counter()
+    naive = [naive_match({u: matcher._user_skills[u].values() for u in matcher._user_skills}, j) for j in sample]
+    naive_s = time.perf_counter() - started
+    fast = [{u: sorted(s) for u, s in matcher.match_job(j).items()} for j in sample]
+
+    print(json.dumps({
+        "users": args.users,
+        "jobs": args.jobs,
+        "distinct_skills": len(matcher),
+        "build_s": round(build_s, 3),
+        "scan_s": round(scan_s, 3),
+        "jobs_per_s": round(args.jobs / scan_s),
+        "user_job_matches": pairs,
+        "update_1000_users_ms": round(update_s * 1000, 2),
+        "naive_ms_per_job": round(naive_s / len(sample) * 1000, 2),
+        "indexed_ms_per_job": round(scan_s / args.jobs * 1000, 4),
+        "naive_agrees": naive == fast,
+    }))
+
+
+if __name__ == "__main__":
+    main()
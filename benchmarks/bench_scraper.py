@@ -0,0 +1,67 @@
+"""
+Scrape-engine throughput and correctness against the local fixture server.
+
+    python benchmarks/bench_scraper.py --queries 200 --latency 0.05
+
+Prints a JSON summary and exits non-zero if the streamed jobs differ from
+what the fixture server is known to serve.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from fixture_server import create_app, expected_external_ids, serve_in_thread  # noqa: E402
+from scraper import RemoteOKAdapter, RemotiveAdapter, ScrapeEngine, scrape_all  # noqa: E402
+
+
+async def run(args) -> dict:
+    base = f"http://127.0.0.1:{args.port}"
+    engine = ScrapeEngine(
+        adapters=[RemotiveAdapter(f"{base}/remotive"), RemoteOKAdapter(f"{base}/remoteok")],
+        per_host_concurrency=args.concurrency,
+        per_host_rate=args.rate,
+    )
+    queries = [f"skill{i}" for i in range(args.queries)]
+    started = time.perf_counter()
+    first_job_at = None
+    ids = set()
+    async for job in scrape_all(queries, engine=engine):
+        if first_job_at is None:
+            first_job_at = time.perf_counter() - started
+        ids.add(job["external_id"])
+    elapsed = time.perf_counter() - started
+    await engine.aclose()
+    expected = expected_external_ids(queries)
+    return {
+        "queries": len(queries),
+        "requests": len(queries) * 2,
+        "jobs": len(ids),
+        "elapsed_s": round(elapsed, 3),
+        "first_job_s": round(first_job_at or 0.0, 3),
+        "requests_per_s": round(len(queries) * 2 / elapsed, 1),
+        "correct": ids == expected,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8701)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, default=16, help="per-host concurrency")
+    parser.add_argument("--rate", type=float, default=0, help="per-host requests/s (0 = unlimited)")
+    args = parser.parse_args()
+    serve_in_thread(create_app(args.latency), args.port)
+    result = asyncio.run(run(args))
+    print(json.dumps(result))
+    if not result["correct"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+GET /jobs serialization benchmark: old per-row path vs one TypeAdapter pass.
+
+    python benchmarks/bench_serialization.py --jobs 10000
+
+"before" copies every document with str() ids, builds Job(**doc) per row and
+lets FastAPI re-validate and encode the list through response_model, as the
+endpoint used to. "after" validates the raw documents once with the cached
+TypeAdapter and dumps JSON bytes in pydantic-core. Both bodies are compared.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from bson import ObjectId  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+from starlette.responses import JSONResponse  # noqa: E402
+
+from models import Job, JobListAdapter, JobSummary, JobSummaryListAdapter  # noqa: E402
+
+
+def make_docs(count: int, rng: random.Random):
+    owner = ObjectId()
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "_id": ObjectId(),
+            "owner_id": owner,
+            "title": f"Engineer {i}",
+            "company": f"Company {rng.randint(0, 500)}",
+            "location": rng.choice([None, "Remote", "Berlin", "New York"]),
+            "description": "lorem ipsum " * rng.randint(20, 200),
+            "link": f"https://example.com/jobs/{i}",
+            "applied": rng.random() < 0.2,
+            "date_added": start + timedelta(minutes=i),
+            "source": rng.choice(["remotive", "remoteok", None]),
+            "external_id": f"ext-{i}",
+            "skills_matched": rng.sample(["python", "go", "rust", "aws", "react"], 2),
+            "last_checked": start + timedelta(minutes=i),
+            "change_history": [
+                {"changed_at": start, "diff": {"title": {"old": "x", "new": f"Engineer {i}"}}}
+            ] * rng.randint(0, 3),
+        }
+        for i in range(count)
+    ]
+
+
+def before(docs, model):
+    jobs = [model(**{**doc, "_id": str(doc["_id"]), "owner_id": str(doc["owner_id"])}) for doc in docs]
+    field = create_model_field(name="Response", type_=List[model], mode="serialization")
+    content = asyncio.run(serialize_response(field=field, response_content=jobs))
+    return JSONResponse(content).body
+
+
+def after(docs, adapter):
+    return adapter.dump_json(adapter.validate_python(docs), by_alias=True)
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    docs = make_docs(args.jobs, random.Random(args.seed))
+    report = {"jobs": args.jobs}
+    for view, model, adapter in (("full", Job, JobListAdapter), ("summary", JobSummary, JobSummaryListAdapter)):
+        old_seconds, old_body = timed(lambda: before(docs, model), args.repeat)
+        new_seconds, new_body = timed(lambda: after(docs, adapter), args.repeat)
+        old, new = json.loads(old_body), json.loads(new_body)
+        # Datetimes differ only in format (isoformat vs RFC 3339 "Z"), so compare ids and lengths
+        same = [j["_id"] for j in old] == [j["_id"] for j in new] and old[0].keys() == new[0].keys()
+        report[view] = {
+            "before_ms": round(old_seconds * 1000, 1),
+            "after_ms": round(new_seconds * 1000, 1),
+            "speedup": round(old_seconds / new_seconds, 2),
+            "bytes": len(new_body),
+            "bodies_agree": same,
+        }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Cold-start benchmark: how long a worker takes to import and to start serving.
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --mongo-uri mongodb://127.0.0.1:27017 --runs 5
+
+Each run uses a fresh interpreter. "import_s" is the time to import main
+(which must not touch the network, even with MongoDB unreachable), and
+"healthz_s" / "readyz_s" are the times from launching uvicorn until
+/healthz and /readyz first answer 200. The default --mongo-uri points at
+a non-routable address, so /readyz is expected to stay 503 and only the
+liveness timing is reported; pass a real server to time readiness too.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app")
+
+# Non-routable: connection attempts hang until they time out
+UNREACHABLE_URI = "mongodb://10.255.255.1:27017"
+
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+
+
+def app_env(args) -> dict:
+    return {
+        **os.environ,
+        "MONGO_URI": args.mongo_uri,
+        "SECRET_KEY": "bench-secret-key",
+        "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+        "SCRAPER_ENABLED": "false",
+        "LOG_LEVEL": "WARNING",
+    }
+
+
+def time_import(args) -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET],
+        cwd=APP_DIR, env=app_env(args), capture_output=True, text=True,
+        timeout=args.timeout, check=True,
+    )
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+def poll(url: str, started: float, deadline: float):
+    """Seconds from `started` until `url` returns 200, or None at the deadline."""
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1).status_code == 200:
+                return time.monotonic() - started
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.01)
+    return None
+
+
+def time_launch(args) -> dict:
+    base = f"http://127.0.0.1:{args.port}"
+    started = time.monotonic()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1",
+         "--port", str(args.port), "--log-level", "warning"],
+        cwd=APP_DIR, env=app_env(args),
+    )
+    try:
+        deadline = started + args.timeout
+        healthz = poll(f"{base}/healthz", started, deadline)
+        readyz = poll(f"{base}/readyz", started, min(deadline, time.monotonic() + args.ready_timeout))
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+    return {"healthz_s": healthz, "readyz_s": readyz}
+
+
+def summarize(values):
+    values = [v for v in values if v is not None]
+    if not values:
+        return None
+    return {
+        "median": round(statistics.median(values), 3),
+        "min": round(min(values), 3),
+        "max": round(max(values), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mongo-uri", default=UNREACHABLE_URI)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-run limit for import and /healthz")
+    parser.add_argument("--ready-timeout", type=float, default=10.0, help="how long to wait for /readyz")
+    args = parser.parse_args()
+
+    imports, launches = [], []
+    for _ in range(args.runs):
+        imports.append(time_import(args))
+        launches.append(time_launch(args))
+
+    report = {
+        "mongo_uri": args.mongo_uri,
+        "runs": args.runs,
+        "import_s": summarize(imports),
+        "healthz_s": summarize([run["healthz_s"] for run in launches]),
+        "readyz_s": summarize([run["readyz_s"] for run in launches]),
+    }
+    print(json.dumps(report, indent=2))
+    if report["healthz_s"] is None:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Telegram webhook load test: replays updates, including redeliveries.
+
+    python benchmarks/bench_webhook.py --updates 5000 --duplicates 0.2
+
+By default the webhook router runs in-process with a stand-in handler that
+sleeps --handler-latency seconds per update (the MongoDB/Bot work), so ack
+latency can be compared with processing time; the run fails unless every
+distinct update_id was handled exactly once. With --url the updates are
+sent to a running server instead and only acks are measured.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+
+def make_updates(count: int, duplicates: float, rng: random.Random):
+    updates = [
+        {
+            "update_id": 100000 + i,
+            "message": {"message_id": i, "chat": {"id": 5000 + i % 300}, "text": "/start"},
+        }
+        for i in range(count)
+    ]
+    # Redeliveries land shortly after the original, like Telegram's retries
+    replayed = list(updates)
+    for _ in range(int(count * duplicates)):
+        i = rng.randrange(count)
+        replayed.insert(min(len(replayed), i + rng.randint(1, 50)), updates[i])
+    return replayed
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+async def replay(client: httpx.AsyncClient, url: str, updates, concurrency: int, secret):
+    headers = {"X-Telegram-Bot-Api-Secret-Token": secret} if secret else {}
+    queue = asyncio.Queue()
+    for update in updates:
+        queue.put_nowait(update)
+    latencies, statuses = [], Counter()
+
+    async def sender():
+        while not queue.empty():
+            update = queue.get_nowait()
+            started = time.perf_counter()
+            response = await client.post(url, json=update, headers=headers)
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(sender() for _ in range(concurrency)))
+    return time.perf_counter() - started, latencies, statuses
+
+
+async def run(args) -> dict:
+    updates = make_updates(args.updates, args.duplicates, random.Random(args.seed))
+    handled = Counter()
+
+    if args.url:
+        async with httpx.AsyncClient(timeout=30) as client:
+            elapsed, latencies, statuses = await replay(client, args.url, updates, args.concurrency, args.secret)
+        report = {}
+    else:
+        from fastapi import FastAPI
+        import telegram_routes
+        from config import settings
+
+        async def handler(update):
+            await asyncio.sleep(args.handler_latency)
+            handled[update["update_id"]] += 1
+
+        processor = telegram_routes.UpdateProcessor(handler=handler, queue_size=args.queue_size)
+        telegram_routes.update_processor = processor
+        app = FastAPI()
+        app.include_router(telegram_routes.router, prefix="/telegram")
+        await processor.start()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://webhook") as client:
+            elapsed, latencies, statuses = await replay(
+                client, "/telegram/webhook", updates, args.concurrency, settings.telegram_webhook_secret
+            )
+        drain_started = time.perf_counter()
+        await processor.stop(drain_timeout=600)
+        distinct = {u["update_id"] for u in updates}
+        report = {
+            "drain_s": round(time.perf_counter() - drain_started, 3),
+            "processor": processor.metrics,
+            # 503s are redelivered by Telegram, so only accepted updates must be handled
+            "exactly_once": set(handled) <= distinct and all(n == 1 for n in handled.values())
+            and (statuses[503] > 0 or set(handled) == distinct),
+        }
+
+    return {
+        "requests": len(updates),
+        "elapsed_s": round(elapsed, 3),
+        "requests_per_s": round(len(updates) / elapsed, 1),
+        "ack_ms": {
+            "p50": round(statistics.median(latencies) * 1000, 2),
+            "p99": round(percentile(latencies, 0.99) * 1000, 2),
+            "max": round(max(latencies) * 1000, 2),
+        },
+        "statuses": dict(statuses),
+        **report,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--updates", type=int, default=5000)
+    parser.add_argument("--duplicates", type=float, default=0.2, help="fraction of updates redelivered")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--handler-latency", type=float, default=0.02)
+    parser.add_argument("--queue-size", type=int, default=10000)
+    parser.add_argument("--url", help="webhook URL of a running server, e.g. http://127.0.0.1:8000/telegram/webhook")
+    parser.add_argument("--secret", default=os.getenv("TELEGRAM_WEBHOOK_SECRET"))
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print(json.dumps(report, indent=2))
+    if report.get("exactly_once") is False:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Stand-in for the Telegram Bot API, for running the app offline.
+
+Answers getMe and sendMessage at /bot<token>/<method> the way
+python-telegram-bot expects, counts what was sent, and can inject
+latency and 429 Too Many Requests responses so the notifier's rate
+limiting and retries get exercised.
+
+    python benchmarks/fake_telegram.py --port 8702 --latency 0.05 --throttle 0.01
+
+Point the app at it with TELEGRAM_API_BASE_URL=http://127.0.0.1:8702/bot
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+
+def create_app(latency: float = 0.0, throttle: float = 0.0, seed: int = 7) -> Starlette:
+    """
+    `throttle` is the fraction of sendMessage calls answered with a 429.
+    Counters are exposed on app.state.stats and at GET /stats.
+    """
+    rng = random.Random(seed)
+    stats = Counter()
+    message_ids = iter(range(1, 10**9))
+
+    async def method(request: Request):
+        name = request.path_params["method"]
+        if request.headers.get("content-type", "").startswith("application/json"):
+            params = await request.json()
+        else:
+            params = dict(await request.form())
+        if latency:
+            await asyncio.sleep(latency)
+        stats[name] += 1
+
+        if name == "getMe":
+            return JSONResponse({"ok": True, "result": {
+                "id": 1, "is_bot": True, "first_name": "AutoTracker", "username": "autotracker_bench_bot",
+            }})
+        if name == "sendMessage":
+            if throttle and rng.random() < throttle:
+                stats["throttled"] += 1
+                return JSONResponse(
+                    {"ok": False, "error_code": 429, "description": "Too Many Requests: retry after 1",
+                     "parameters": {"retry_after": 1}},
+                    status_code=429,
+                )
+            stats["delivered"] += 1
+            chat_id = int(params["chat_id"])
+            return JSONResponse({"ok": True, "result": {
+                "message_id": next(message_ids),
+                "date": int(time.time()),
+                "chat": {"id": chat_id, "type": "private" if chat_id > 0 else "group"},
+                "text": params.get("text", ""),
+            }})
+        return JSONResponse({"ok": True, "result": True})
+
+    async def show_stats(request: Request):
+        return JSONResponse(dict(stats))
+
+    app = Starlette(routes=[
+        Route("/bot{token}/{method}", method, methods=["GET", "POST"]),
+        Route("/stats", show_stats),
+    ])
+    app.state.stats = stats
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--port", type=int, default=8702)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--throttle", type=float, default=0.0, help="fraction of sends answered with 429")
+    args = parser.parse_args()
+    uvicorn.run(create_app(args.latency, args.throttle), host="127.0.0.1", port=args.port, log_level="warning")
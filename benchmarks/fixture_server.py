@@ -0,0 +1,98 @@
+"""
+Deterministic stand-in for the job boards the scraper talks to.
+
+Serves Remotive- and RemoteOK-shaped JSON at /remotive and /remoteok so
+the scrape engine can be exercised offline. Every (source, query) returns
+the same jobs on every run; ids are drawn from a shared pool so different
+skill queries overlap the way real boards do. Responses carry an ETag and
+honour If-None-Match, so conditional fetching can be checked too.
+
+    python benchmarks/fixture_server.py --port 8701 --latency 0.05
+"""
+import argparse
+import asyncio
+import hashlib
+import threading
+import time
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+JOBS_PER_QUERY = 25
+ID_POOL = 5000
+
+
+def job_ids(source: str, query: str, count: int = JOBS_PER_QUERY):
+    digest = hashlib.sha1(f"{source}:{query}".encode()).digest()
+    start = int.from_bytes(digest[:4], "big") % ID_POOL
+    return [(start + i * 7) % ID_POOL for i in range(count)]
+
+
+def expected_external_ids(queries, sources=("remotive", "remoteok")):
+    """The distinct external ids a full scrape of `queries` should produce."""
+    return {f"{source}:{i}" for source in sources for query in queries for i in job_ids(source, query)}
+
+
+def _conditional(request: Request, source: str, query: str, payload) -> Response:
+    etag = '"' + hashlib.sha1(f"{source}:{query}:{JOBS_PER_QUERY}".encode()).hexdigest() + '"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return JSONResponse(payload, headers={"ETag": etag})
+
+
+def create_app(latency: float = 0.0) -> Starlette:
+    async def remotive(request: Request):
+        if latency:
+            await asyncio.sleep(latency)
+        query = request.query_params.get("search", "")
+        jobs = [
+            {
+                "id": i,
+                "url": f"https://remotive.example/jobs/{i}",
+                "title": f"{query.title()} Engineer #{i}",
+                "company_name": f"Company {i % 97}",
+                "candidate_required_location": "Worldwide",
+                "description": f"<p>We use {query} every day.</p>",
+            }
+            for i in job_ids("remotive", query)
+        ]
+        return _conditional(request, "remotive", query, {"job-count": len(jobs), "jobs": jobs})
+
+    async def remoteok(request: Request):
+        if latency:
+            await asyncio.sleep(latency)
+        query = request.query_params.get("tag", "")
+        jobs = [{"legal": "fixture"}] + [
+            {
+                "id": str(i),
+                "url": f"https://remoteok.example/remote-jobs/{i}",
+                "position": f"Senior {query} Developer #{i}",
+                "company": f"Startup {i % 89}",
+                "location": "Remote",
+                "description": f"{query} and friends",
+            }
+            for i in job_ids("remoteok", query)
+        ]
+        return _conditional(request, "remoteok", query, jobs)
+
+    return Starlette(routes=[Route("/remotive", remotive), Route("/remoteok", remoteok)])
+
+
+def serve_in_thread(app, port: int) -> uvicorn.Server:
+    """Start `app` on 127.0.0.1:port in a daemon thread and wait until it's up."""
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--port", type=int, default=8701)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    args = parser.parse_args()
+    uvicorn.run(create_app(args.latency), host="127.0.0.1", port=args.port, log_level="warning")
@@ -57,6 +57,14 @@ class ApiClient {
     endpoint: string,
     options: RequestInit = {}
   ): Promise<T> {
+    const { data } = await this.requestWithHeaders<T>(endpoint, options);
+    return data;
+  }
+
+  private async requestWithHeaders<T>(
+    endpoint: string,
+    options: RequestInit = {}
+  ): Promise<{ data: T; headers: Headers }> {
     const headers: HeadersInit = {
       'Content-Type': 'application/json',
       ...options.headers,
@@ -76,7 +84,7 @@ class ApiClient {
       throw new Error(error.detail || `HTTP ${response.status}`);
     }
 
-    return response.json();
+    return { data: await response.json(), headers: response.headers };
   }
 
   // Auth
@@ -112,7 +120,17 @@ class ApiClient {
 
   // Jobs
   async getJobs() {
-    return this.request<Job[]>('/jobs/');
+    // The list endpoint is cursor-paginated; follow X-Next-Cursor to the end
+    const jobs: Job[] = [];
+    let cursor: string | null = null;
+    do {
+      const params = new URLSearchParams({ limit: '500' });
+      if (cursor) params.set('cursor', cursor);
+      const { data, headers } = await this.requestWithHeaders<Job[]>(`/jobs/?${params}`);
+      jobs.push(...data);
+      cursor = headers.get('X-Next-Cursor');
+    } while (cursor);
+    return jobs;
   }
 
   async getJob(id: string) {
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The app is run from app/ and imports its modules by bare name
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
@@ -0,0 +1,52 @@
+"""TTLCache expiry, LRU eviction and epoch-guarded writes."""
+from utils import cache as cache_module
+from utils.cache import TTLCache
+
+
+def test_get_returns_value_until_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = TTLCache(maxsize=10, ttl=5)
+    cache.set("alice", {"_id": "1"})
+    assert cache.get("alice") == {"_id": "1"}
+    now[0] += 5
+    assert cache.get("alice") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_write_loaded_before_an_invalidation_is_dropped():
+    cache = TTLCache(maxsize=10, ttl=60)
+    epoch = cache.epoch()
+    # Another request updates the user while this one is still reading it
+    cache.invalidate("alice")
+    cache.set("alice", {"skills": ["stale"]}, epoch)
+    assert cache.get("alice") is None
+
+    cache.set("alice", {"skills": ["fresh"]}, cache.epoch())
+    assert cache.get("alice") == {"skills": ["fresh"]}
+
+
+def test_clear_also_bumps_the_epoch():
+    cache = TTLCache(maxsize=10, ttl=60)
+    epoch = cache.epoch()
+    cache.clear()
+    cache.set("alice", 1, epoch)
+    assert cache.get("alice") is None
+
+
+def test_disabled_cache_stores_nothing():
+    cache = TTLCache(maxsize=0, ttl=60)
+    cache.set("alice", 1)
+    assert cache.get("alice") is None
@@ -0,0 +1,83 @@
+"""
+Every hot router query must be served by an index, checked with explain()
+against a real server. Uses TEST_MONGO_URI (default localhost:27017), or
+starts a scratch mongod when one is on PATH; skipped when neither works.
+"""
+import asyncio
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import uuid
+
+import pytest
+
+pytest.importorskip("pymongo")
+from pymongo import AsyncMongoClient, MongoClient
+from pymongo.errors import PyMongoError
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+from indexes import HOT_QUERIES, ensure_indexes, explain_hot_queries
+
+TEST_MONGO_URI = os.getenv("TEST_MONGO_URI", "mongodb://127.0.0.1:27017")
+
+
+def _reachable(uri: str, timeout_ms: int = 1000) -> bool:
+    client = MongoClient(uri, serverSelectionTimeoutMS=timeout_ms)
+    try:
+        client.admin.command("ping")
+        return True
+    except PyMongoError:
+        return False
+    finally:
+        client.close()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(scope="module")
+def mongo_uri():
+    if _reachable(TEST_MONGO_URI):
+        yield TEST_MONGO_URI
+        return
+    binary = shutil.which("mongod")
+    if binary is None:
+        pytest.skip("no MongoDB server at TEST_MONGO_URI and no mongod on PATH")
+    port = _free_port()
+    dbpath = tempfile.mkdtemp(prefix="test-mongod-")
+    process = subprocess.Popen(
+        [binary, "--dbpath", dbpath, "--port", str(port), "--bind_ip", "127.0.0.1", "--quiet"],
+        stdout=subprocess.DEVNULL,
+    )
+    uri = f"mongodb://127.0.0.1:{port}"
+    try:
+        if not _reachable(uri, timeout_ms=30000):
+            pytest.skip("scratch mongod did not start")
+        yield uri
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+        shutil.rmtree(dbpath, ignore_errors=True)
+
+
+def test_hot_queries_are_index_backed(mongo_uri):
+    async def run():
+        client = AsyncMongoClient(mongo_uri)
+        database = client.get_database(f"test_indexes_{uuid.uuid4().hex}")
+        try:
+            await ensure_indexes(database)
+            return await explain_hot_queries(database)
+        finally:
+            await client.drop_database(database.name)
+            await client.close()
+
+    plans = asyncio.run(run())
+    assert set(plans) == {label for label, *_ in HOT_QUERIES}
+    unindexed = [label for label, index_name in plans.items() if index_name is None]
+    assert unindexed == []
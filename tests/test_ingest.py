@@ -0,0 +1,114 @@
+"""Content hashing, field diffs and the hash-guarded ingest writes."""
+import asyncio
+from types import SimpleNamespace
+
+from bson import ObjectId
+
+import ingest
+from ingest import content_hash, diff_fields, ingest_jobs
+
+OWNER = ObjectId()
+
+
+def _job(external_id="remotive:1", **fields):
+    return {
+        "external_id": external_id, "title": "Python dev", "company": "Acme", "location": "Remote",
+        "description": "Build things", "link": "https://jobs.example/1", "source": "remotive",
+        "skills_matched": ["python"], **fields,
+    }
+
+
+def test_content_hash_ignores_bookkeeping_and_skill_order():
+    job = _job(skills_matched=["python", "django"])
+    same = {**_job(skills_matched=["django", "python"]), "applied": True, "last_checked": "now"}
+    assert content_hash(job) == content_hash(same)
+    assert content_hash(job) != content_hash({**job, "title": "Senior Python dev"})
+
+
+def test_diff_fields_lists_changed_content_only():
+    old = {**_job(), "applied": False}
+    new = {**_job(title="Senior Python dev", link="https://jobs.example/2"), "applied": True}
+    assert diff_fields(old, new) == {
+        "title": {"old": "Python dev", "new": "Senior Python dev"},
+        "link": {"old": "https://jobs.example/1", "new": "https://jobs.example/2"},
+    }
+
+
+class _Cursor:
+    def __init__(self, docs):
+        self._docs = iter(docs)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._docs)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class _Jobs:
+    """Stand-in for the jobs collection; `matched` decides each update_one."""
+
+    def __init__(self, existing, matched=True):
+        self.existing = existing
+        self.matched = matched
+
+    def find(self, query, projection=None):
+        return _Cursor(self.existing)
+
+    async def bulk_write(self, ops, ordered=True):
+        return SimpleNamespace(bulk_api_result={
+            "nUpserted": len(ops), "upserted": [{"index": i} for i in range(len(ops))],
+        })
+
+    async def update_one(self, query, update):
+        return SimpleNamespace(matched_count=1 if self.matched else 0)
+
+
+def _run_ingest(monkeypatch, collection, jobs):
+    recorded = {"stats": [], "changes": []}
+
+    async def apply_stats_delta(owner_id, added=(), removed=()):
+        recorded["stats"].append((list(added), list(removed)))
+
+    async def record_changes(changes):
+        recorded["changes"].extend(changes)
+
+    async def bump_version(owner_id):
+        recorded["bumped"] = True
+
+    monkeypatch.setattr(ingest, "require_collections", lambda: (None, collection))
+    monkeypatch.setattr(ingest, "apply_stats_delta", apply_stats_delta)
+    monkeypatch.setattr(ingest, "record_changes", record_changes)
+    monkeypatch.setattr(ingest, "bump_version", bump_version)
+    return asyncio.run(ingest_jobs(OWNER, jobs)), recorded
+
+
+def _stored(**fields):
+    job = _job(**fields)
+    return {**job, "_id": ObjectId(), "content_hash": content_hash(_job()), "applied": False}
+
+
+def test_changed_posting_is_updated_and_logged(monkeypatch):
+    result, recorded = _run_ingest(monkeypatch, _Jobs([_stored()]), [_job(title="Senior Python dev")])
+    assert (result.inserted, result.updated, result.unchanged) == (0, 1, 0)
+    assert [kind for kind, _ in result.events] == ["updated"]
+    assert recorded["changes"][0]["diff"] == {"title": {"old": "Python dev", "new": "Senior Python dev"}}
+
+
+def test_update_that_lost_the_hash_guard_has_no_side_effects(monkeypatch):
+    collection = _Jobs([_stored()], matched=False)
+    result, recorded = _run_ingest(monkeypatch, collection, [_job(title="Senior Python dev")])
+    assert (result.updated, result.events, recorded["changes"]) == (0, [], [])
+    assert recorded["stats"] == [([], [])]
+    assert "bumped" not in recorded
+
+
+def test_new_and_unchanged_postings(monkeypatch):
+    jobs = [_job(), _job("remotive:2"), {"title": "no id"}]
+    result, recorded = _run_ingest(monkeypatch, _Jobs([_stored()]), jobs)
+    assert (result.inserted, result.updated, result.unchanged) == (1, 0, 1)
+    assert [job["external_id"] for _, job in result.events] == ["remotive:2"]
+    assert len(result.errors) == 1
@@ -0,0 +1,143 @@
+"""Link classification, expiry planning and the checker's write-back."""
+import asyncio
+from datetime import datetime, timezone
+
+import httpx
+from bson import ObjectId
+
+import linkcheck
+from linkcheck import LinkChecker, LinkResult, classify, plan_updates
+
+NOW = datetime(2025, 3, 1, tzinfo=timezone.utc)
+OWNER = ObjectId()
+
+
+def _job(**fields):
+    return {"_id": ObjectId(), "owner_id": OWNER, "link": "https://jobs.example/1", **fields}
+
+
+def test_classify():
+    assert classify(200) == LinkResult(200, False)
+    assert classify(301) == LinkResult(301, False)
+    assert classify(404).expired is True
+    assert classify(410).expired is True
+    assert classify(500).expired is None
+    assert classify(429).expired is None
+
+
+def test_unchecked_links_only_move_back_in_the_queue():
+    job = _job(link="mailto:jobs@example.com")
+    (op,), changes = plan_updates([job], [LinkResult(0, None)], NOW)
+    assert op._doc == {"$set": {"last_checked": NOW}}
+    assert changes == []
+
+
+def test_gone_link_expires_and_logs_the_change():
+    job = _job(link_failures=2)
+    (op,), (change,) = plan_updates([job], [classify(404)], NOW)
+    assert op._doc["$set"] == {"last_checked": NOW, "link_status": 404, "link_failures": 0, "expired": True}
+    assert "$push" in op._doc
+    assert change["job_id"] == job["_id"] and change["owner_id"] == OWNER
+    assert change["diff"] == {"expired": {"old": False, "new": True}}
+
+
+def test_inconclusive_probes_expire_after_max_failures():
+    job = _job(link_failures=1)
+    (op,), changes = plan_updates([job], [LinkResult(0, None)], NOW, max_failures=3)
+    assert op._doc["$set"]["link_failures"] == 2
+    assert "expired" not in op._doc["$set"] and changes == []
+
+    job = _job(link_failures=2)
+    (op,), (change,) = plan_updates([job], [LinkResult(503, None)], NOW, max_failures=3)
+    assert op._doc["$set"]["expired"] is True
+    assert change["diff"]["expired"]["new"] is True
+
+
+def test_live_link_revives_an_expired_job():
+    ops, changes = plan_updates([_job(expired=True), _job(expired=False)], [classify(200), classify(200)], NOW)
+    assert ops[0]._doc["$set"]["expired"] is False
+    assert "expired" not in ops[1]._doc["$set"]
+    assert [c["diff"]["expired"]["new"] for c in changes] == [False]
+
+
+def test_probe_falls_back_to_get_when_head_is_refused():
+    def respond(request):
+        if request.method == "HEAD":
+            return httpx.Response(405)
+        return httpx.Response(404 if request.url.path == "/gone" else 200)
+
+    async def scenario():
+        checker = LinkChecker(client=httpx.AsyncClient(transport=httpx.MockTransport(respond)))
+        try:
+            return await checker.check_many(["https://a.example/ok", "https://a.example/gone", None])
+        finally:
+            await checker.client.aclose()
+
+    ok, gone, missing = asyncio.run(scenario())
+    assert (ok.status, ok.expired) == (200, False)
+    assert (gone.status, gone.expired) == (404, True)
+    assert missing == LinkResult(0, None)
+
+
+class _Cursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, *args):
+        return self
+
+    def limit(self, n):
+        return self
+
+    async def to_list(self):
+        return self.docs
+
+
+class _Jobs:
+    def __init__(self, docs):
+        self.docs = docs
+        self.writes = []
+
+    def find(self, query, projection=None):
+        return _Cursor(self.docs)
+
+    async def bulk_write(self, ops, ordered=True):
+        self.writes.append(ops)
+
+
+def test_run_once_bumps_versions_only_for_flipped_owners(monkeypatch):
+    other = ObjectId()
+    jobs = [
+        _job(link="https://a.example/gone"),
+        {**_job(link="https://a.example/ok"), "owner_id": other},
+        _job(link="https://a.example/gone", expired=True),
+    ]
+    collection = _Jobs(jobs)
+    recorded = {"changes": [], "bumped": []}
+
+    async def record_changes(changes):
+        recorded["changes"].extend(changes)
+
+    async def bump_versions(owner_ids):
+        recorded["bumped"].append(list(owner_ids))
+
+    monkeypatch.setattr(linkcheck, "require_collections", lambda: (None, collection))
+    monkeypatch.setattr(linkcheck, "record_changes", record_changes)
+    monkeypatch.setattr(linkcheck, "bump_versions", bump_versions)
+
+    def respond(request):
+        return httpx.Response(404 if request.url.path == "/gone" else 200)
+
+    async def scenario():
+        checker = LinkChecker(client=httpx.AsyncClient(transport=httpx.MockTransport(respond)))
+        try:
+            return checker, await checker.run_once()
+        finally:
+            await checker.client.aclose()
+
+    checker, checked = asyncio.run(scenario())
+    assert checked == 3
+    assert len(collection.writes) == 1 and len(collection.writes[0]) == 3
+    assert [c["job_id"] for c in recorded["changes"]] == [jobs[0]["_id"]]
+    assert recorded["bumped"] == [[OWNER]]
+    assert checker.metrics == {"checked": 3, "expired": 1, "revived": 0, "inconclusive": 0}
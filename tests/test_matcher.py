@@ -0,0 +1,43 @@
+"""SkillMatcher index maintenance and matching."""
+from matcher import SkillMatcher, normalize_skill, tokenize
+
+
+def test_tokenize_keeps_language_names():
+    assert tokenize("C++, C# and Node.js with Python.") == ["c++", "c#", "and", "node.js", "with", "python"]
+    assert normalize_skill("  Machine   Learning ") == "machine learning"
+
+
+def test_match_reports_skills_as_each_user_wrote_them():
+    m = SkillMatcher()
+    m.set_user_skills("ann", ["Python", "Machine Learning"])
+    m.set_user_skills("bob", ["python", "Go"])
+    matches = m.match("Senior PYTHON engineer, machine learning team")
+    assert sorted(matches["ann"]) == ["Machine Learning", "Python"]
+    assert matches["bob"] == ["python"]
+    assert m.match("learning machine") == {}
+
+
+def test_multi_word_phrase_needs_consecutive_tokens():
+    m = SkillMatcher()
+    m.set_user_skills("ann", ["react native"])
+    assert m.match_skills("react native developer") == {"react native"}
+    assert m.match_skills("react and native apps") == set()
+
+
+def test_set_user_skills_is_incremental():
+    m = SkillMatcher()
+    m.set_user_skills("ann", ["python", "go"])
+    m.set_user_skills("bob", ["python"])
+    assert m.skills() == {"python": 2, "go": 1}
+    assert m.subscribers("python") == {"ann", "bob"}
+
+    m.set_user_skills("ann", ["Python", "rust"])
+    assert m.skills() == {"python": 2, "rust": 1}
+    assert m.match_skills("go developer") == set()
+
+    m.remove_user("bob")
+    assert m.subscribers("python") == {"ann"}
+    assert m.users() == ["ann"]
+
+    m.set_user_skills("ann", [" ", ""])
+    assert (len(m), m.users(), m._index) == (0, [], {})
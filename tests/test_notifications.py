@@ -0,0 +1,57 @@
+"""Digest formatting and per-chat coalescing of job notifications."""
+import asyncio
+
+from notifications import TELEGRAM_MESSAGE_LIMIT, NotificationCoalescer, format_digest
+
+
+def _job(i, **fields):
+    return {"_id": f"id{i}", "title": f"Job {i}", "company": "Acme", "link": f"https://jobs.example/{i}", **fields}
+
+
+def test_digest_counts_and_truncates_to_top_n():
+    events = [("new", _job(i)) for i in range(4)] + [("updated", _job(9))]
+    (message,) = format_digest(events, top_n=2)
+    lines = message.split("\n")
+    assert lines[0] == "📬 Job updates: 4 new, 1 updated"
+    assert "🆕 Job 0 — Acme" in lines and "🆕 Job 1 — Acme" in lines
+    assert "Job 2" not in message
+    assert lines[-1] == "…and 3 more"
+
+
+def test_digest_splits_under_the_telegram_limit():
+    events = [("new", _job(i, title="x" * 1000)) for i in range(10)]
+    messages = format_digest(events, top_n=10)
+    assert len(messages) > 1
+    assert all(len(m) <= TELEGRAM_MESSAGE_LIMIT for m in messages)
+    assert sum(m.count("x" * 1000) for m in messages) == 10
+
+
+def test_digest_cuts_a_single_oversized_line():
+    messages = format_digest([("new", _job(1, title="y" * 5000)), ("new", _job(2))], top_n=2)
+    assert all(len(m) <= TELEGRAM_MESSAGE_LIMIT for m in messages)
+
+
+def test_coalescer_collapses_repeats_and_sends_one_digest():
+    sent = []
+    coalescer = NotificationCoalescer(send=lambda chat, text: sent.append((chat, text)), window=60, top_n=10)
+
+    async def scenario():
+        coalescer.job_event("42", "new", _job(1))
+        coalescer.job_event("42", "updated", _job(1, title="Job 1 v2"))
+        coalescer.job_event("42", "updated", _job(2))
+        coalescer.job_event(None, "new", _job(3))
+        coalescer.flush_all()
+
+    asyncio.run(scenario())
+    assert len(sent) == 1
+    chat, text = sent[0]
+    assert chat == "42"
+    assert text.startswith("📬 Job updates: 1 new, 1 updated")
+    assert "Job 1 v2" in text
+
+
+def test_single_event_uses_the_job_message():
+    sent = []
+    coalescer = NotificationCoalescer(send=lambda chat, text: sent.append(text), window=0)
+    coalescer.job_event(7, "new", _job(1))
+    assert len(sent) == 1 and sent[0].startswith("🆕 New Job Added!")
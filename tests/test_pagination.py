@@ -0,0 +1,41 @@
+"""Opaque keyset cursors and the filters built from them."""
+from datetime import datetime, timezone
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+from utils.pagination import decode_cursor, encode_cursor, keyset_after, next_cursor
+
+
+def test_cursor_round_trips_bson_values():
+    values = [datetime(2025, 3, 1, 12, 30, tzinfo=timezone.utc), ObjectId()]
+    cursor = encode_cursor(values)
+    assert "=" not in cursor
+    decoded = decode_cursor(cursor, 2)
+    assert decoded[1] == values[1]
+    assert decoded[0].replace(tzinfo=timezone.utc) == values[0]
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", encode_cursor({"a": 1}), encode_cursor([1])])
+def test_decode_cursor_rejects_garbage_and_wrong_shape(cursor):
+    with pytest.raises(HTTPException) as e:
+        decode_cursor(cursor, 2)
+    assert e.value.status_code == 400
+
+
+def test_keyset_after_descending():
+    assert keyset_after(["date_added", "_id"], ["d", "i"]) == {"$or": [
+        {"date_added": {"$lt": "d"}},
+        {"date_added": "d", "_id": {"$lt": "i"}},
+    ]}
+
+
+def test_keyset_after_ascending():
+    assert keyset_after(["changed_at"], [5], descending=False) == {"$or": [{"changed_at": {"$gt": 5}}]}
+
+
+def test_next_cursor_only_when_a_row_beyond_limit_was_fetched():
+    rows = [{"date_added": n, "_id": n} for n in range(3)]
+    assert next_cursor(rows, 3, ["date_added", "_id"]) is None
+    assert decode_cursor(next_cursor(rows, 2, ["date_added", "_id"]), 2) == [1, 1]
@@ -0,0 +1,81 @@
+"""Per-host limits and the streaming scrape engine, against a mock transport."""
+import asyncio
+
+import httpx
+
+from scraper import HostLimiter, HostLimiters, RemotiveAdapter, ScrapeEngine, fetch_key, scrape_all
+
+
+def _remotive_jobs(*ids):
+    return {"jobs": [
+        {"id": i, "title": f"Job {i}", "company_name": "Acme", "candidate_required_location": "Remote",
+         "description": "<p>Python</p>", "url": f"https://jobs.example/{i}"}
+        for i in ids
+    ]}
+
+
+def _engine(handler):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return ScrapeEngine(adapters=[RemotiveAdapter("https://remotive.example/api")], client=client)
+
+
+def test_host_limiters_share_one_limiter_per_host():
+    limiters = HostLimiters(concurrency=2, rate=0)
+    assert limiters.for_url("https://a.example/x") is limiters.for_url("https://a.example/y?q=1")
+    assert limiters.for_url("https://a.example/x") is not limiters.for_url("https://b.example/x")
+
+
+def test_cancel_while_rate_limited_releases_the_permit():
+    async def run():
+        limiter = HostLimiter(concurrency=1, rate=1)
+        async with limiter:
+            pass
+        # The next slot is a second away, so this waits holding the permit
+        waiting = asyncio.create_task(limiter.__aenter__())
+        await asyncio.sleep(0.01)
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        assert not limiter.semaphore.locked()
+
+    asyncio.run(run())
+
+
+def test_stream_dedupes_and_reports_results():
+    def handler(request):
+        return httpx.Response(200, json=_remotive_jobs(1, 2), headers={"ETag": '"e1"'})
+
+    async def run():
+        engine = _engine(handler)
+        results = {}
+        jobs = [job async for job in scrape_all(["python", "django"], engine=engine, results=results)]
+        await engine.aclose()
+        return jobs, results
+
+    jobs, results = asyncio.run(run())
+    assert sorted(job["external_id"] for job in jobs) == ["remotive:1", "remotive:2"]
+    assert jobs[0]["description"] == "Python"
+    assert set(results) == {fetch_key("remotive", "python"), fetch_key("remotive", "django")}
+    assert all(r.status == 200 and r.etag == '"e1"' for r in results.values())
+
+
+def test_fetch_sends_validators_and_handles_304_and_errors():
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers.get("If-None-Match"))
+        if request.url.params["search"] == "broken":
+            return httpx.Response(500)
+        return httpx.Response(304)
+
+    async def run():
+        engine = _engine(handler)
+        adapter = engine.adapters[0]
+        unchanged = await engine.fetch(adapter, "python", {"etag": '"e1"'})
+        failed = await engine.fetch(adapter, "broken")
+        await engine.aclose()
+        return unchanged, failed
+
+    unchanged, failed = asyncio.run(run())
+    assert seen == ['"e1"', None]
+    assert (unchanged.status, unchanged.etag, unchanged.jobs) == (304, '"e1"', [])
+    assert (failed.status, failed.jobs) == (0, [])
@@ -0,0 +1,44 @@
+"""Stats deltas and the key escaping they rely on."""
+from datetime import datetime, timezone
+
+from stats import NONE_KEY, escape_key, stats_delta, unescape_key, week_key
+
+
+def _job(**fields):
+    return {"company": "Acme", "source": "remotive", "applied": False,
+            "date_added": datetime(2025, 2, 12, tzinfo=timezone.utc), **fields}
+
+
+def test_added_job_counts_everywhere():
+    assert stats_delta(added=[_job()]) == {
+        "total": 1, "by_company.Acme": 1, "by_source.remotive": 1, "by_week.2025-W07": 1,
+    }
+
+
+def test_update_only_writes_counters_that_moved():
+    old, new = _job(), _job(applied=True, company="Globex")
+    assert stats_delta(added=[new], removed=[old]) == {
+        "applied": 1, "by_company.Globex": 1, "by_company.Acme": -1,
+    }
+    assert stats_delta(added=[old], removed=[old]) == {}
+
+
+def test_removed_jobs_decrement():
+    delta = stats_delta(removed=[_job(applied=True), _job(date_added=None, source=None)])
+    assert delta == {
+        "total": -2, "applied": -1, "by_company.Acme": -2, "by_source.remotive": -1,
+        f"by_source.{NONE_KEY}": -1, "by_week.2025-W07": -1,
+    }
+
+
+def test_keys_are_escaped_reversibly():
+    for value in ("Node.js Inc", "$corp", "100% remote", "a%2Eb"):
+        key = escape_key(value)
+        assert "." not in key and not key.startswith("$")
+        assert unescape_key(key) == value
+    assert escape_key(None) == escape_key("") == NONE_KEY
+
+
+def test_week_key_uses_iso_weeks():
+    assert week_key(datetime(2021, 1, 3)) == "2020-W53"
+    assert week_key(None) is None
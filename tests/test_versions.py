@@ -0,0 +1,54 @@
+"""ETag construction/comparison and bulk version bumps."""
+import asyncio
+
+from bson import ObjectId
+
+import versions
+from versions import bump_versions, etag_matches, make_etag
+
+OWNER = ObjectId()
+
+
+def test_make_etag_changes_with_version_and_parts():
+    etag = make_etag(OWNER, 3, "page", 1)
+    assert etag.startswith('"v3.') and etag.endswith('"')
+    assert etag == make_etag(str(OWNER), 3, "page", 1)
+    assert etag != make_etag(OWNER, 4, "page", 1)
+    assert etag != make_etag(OWNER, 3, "page", 2)
+
+
+def test_etag_matches_lists_and_wildcard():
+    etag = make_etag(OWNER, 1)
+    assert etag_matches(f'"other", {etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches("", etag)
+
+
+def test_weak_validators_only_match_weakly():
+    etag = make_etag(OWNER, 1)
+    assert etag_matches(f"W/{etag}", etag)
+    assert not etag_matches(f"W/{etag}", etag, weak=False)
+    assert etag_matches(etag, etag, weak=False)
+
+
+
+class _Versions:
+    def __init__(self):
+        self.calls = []
+
+    async def bulk_write(self, ops, ordered=True):
+        self.calls.append(ops)
+
+
+def test_bump_versions_sends_one_op_per_owner(monkeypatch):
+    collection = _Versions()
+    monkeypatch.setattr(versions, "_collection", lambda: collection)
+    other = ObjectId()
+    asyncio.run(bump_versions([OWNER, str(OWNER), other]))
+    (ops,) = collection.calls
+    assert sorted(op._filter["_id"] for op in ops) == sorted([OWNER, other])
+
+    asyncio.run(bump_versions([]))
+    assert len(collection.calls) == 1
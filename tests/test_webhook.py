@@ -0,0 +1,53 @@
+"""Webhook update dedup and queueing."""
+import asyncio
+
+from telegram_routes import UpdateProcessor, _RecentIds
+
+
+def test_recent_ids_forget_the_oldest():
+    seen = _RecentIds(2)
+    assert seen.add(1) and seen.add(2)
+    assert not seen.add(1)
+    # 1 was touched last, so 2 is evicted
+    assert seen.add(3)
+    assert seen.add(2)
+    assert not seen.add(3)
+
+
+def test_duplicates_are_acked_and_handled_once():
+    handled = []
+
+    async def handler(update):
+        handled.append(update["update_id"])
+
+    async def scenario():
+        processor = UpdateProcessor(handler, queue_size=10, workers=2, dedup_size=100)
+        await processor.start()
+        results = [processor.submit({"update_id": i}) for i in (1, 2, 1, 3, 2)]
+        await processor.stop()
+        return processor, results
+
+    processor, results = asyncio.run(scenario())
+    assert all(results)
+    assert sorted(handled) == [1, 2, 3]
+    assert processor.metrics["received"] == 5
+    assert processor.metrics["duplicates"] == 2
+    assert processor.metrics["processed"] == 3
+
+
+def test_full_queue_rejects_and_allows_redelivery():
+    async def scenario():
+        processor = UpdateProcessor(lambda update: asyncio.sleep(0), queue_size=1, workers=1, dedup_size=100)
+        assert not processor.submit({"update_id": 1})  # not running
+        await processor.start()
+        first = processor.submit({"update_id": 1})
+        # The worker hasn't run yet, so the queue is still full
+        second = processor.submit({"update_id": 2})
+        await processor.stop()
+        retried = processor.submit({"update_id": 2})
+        return processor, first, second, retried
+
+    processor, first, second, retried = asyncio.run(scenario())
+    assert (first, second, retried) == (True, False, False)
+    assert processor.metrics["rejected"] == 3
+    assert processor.metrics["duplicates"] == 0